@@ -4,19 +4,23 @@ Comprehensive graphical overviews with multiple view options
 Author: Vulnuris Development Team
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
+import plotly.io as pio
 from plotly.subplots import make_subplots
 from datetime import datetime, timedelta, date
+import functools
+import os
 import sqlite3
 import json
 import io
 import base64
 from flows_tracker import ClientFlowsTracker
+from analytics_kernels import group_aggregate, group_matrix
 
 # Page configuration
 st.set_page_config(
@@ -26,6 +30,467 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Numeric client columns that are safe to hold as float32
+FLOAT32_COLUMNS = [
+    'current_aum', 'initial_corpus', 'additions', 'withdrawals', 'net_corpus',
+    'annualised_returns', 'bse_500_benchmark_returns', 'nav_bucket',
+    'annual_income', 'client_since'
+]
+
+# Client columns read by the dashboard views (projection for load_data)
+CLIENT_COLUMNS = [
+    'client_id', 'client_name', 'current_aum', 'initial_corpus', 'additions', 'withdrawals',
+    'annualised_returns', 'bse_500_benchmark_returns', 'rm_name', 'portfolio_type',
+    'risk_profile', 'city', 'occupation', 'annual_income', 'age_of_client', 'client_since'
+]
+
+# Every stored client data column in schema order, without the table's id/audit columns (exports)
+CLIENT_RECORD_COLUMNS = [
+    'client_id', 'client_name', 'nav_bucket', 'inception_date', 'age_of_client', 'client_since',
+    'mobile', 'email', 'distributor_name', 'current_aum', 'initial_corpus', 'additions', 'withdrawals',
+    'net_corpus', 'annualised_returns', 'bse_500_benchmark_returns', 'rm_name', 'portfolio_type',
+    'risk_profile', 'city', 'state', 'occupation', 'annual_income', 'investment_objective'
+]
+
+# Portfolio types offered, and the fixed colour each one is drawn in across filters and charts
+PORTFOLIO_TYPES = ["Equity", "Debt", "Hybrid", "Multi-Asset", "ELSS", "Sectoral", "International"]
+PORTFOLIO_COLOR_MAP = dict(zip(PORTFOLIO_TYPES, px.colors.qualitative.Set3))
+
+# Values of the other categorical client columns
+RISK_PROFILES = ["Conservative", "Moderate", "Aggressive", "Very Aggressive"]
+RM_NAMES = ["Rajesh Kumar", "Priya Sharma", "Amit Patel", "Sunita Gupta", "Vikram Singh", "Neha Agarwal", "Rohit Jain"]
+CITIES = ["Mumbai", "Delhi", "Bangalore", "Chennai", "Kolkata", "Hyderabad", "Pune", "Ahmedabad", "Surat", "Jaipur"]
+OCCUPATIONS = ["Business", "Service", "Professional", "Retired", "Government", "Self-Employed"]
+
+# Low-cardinality grouping keys held as categoricals so groupbys hash int codes. The categories
+# are fixed (sorted) so every load yields the same dtypes; values outside them read as missing
+CATEGORY_DTYPES = {
+    'portfolio_type': pd.CategoricalDtype(sorted(PORTFOLIO_TYPES), ordered=True),
+    'risk_profile': pd.CategoricalDtype(sorted(RISK_PROFILES)),
+    'rm_name': pd.CategoricalDtype(sorted(RM_NAMES), ordered=True),
+    'city': pd.CategoricalDtype(sorted(CITIES)),
+    'occupation': pd.CategoricalDtype(sorted(OCCUPATIONS))
+}
+CATEGORY_COLUMNS = list(CATEGORY_DTYPES)
+
+# Storage dtypes applied while reading clients, so both load paths build the same frame in one pass
+CLIENT_DTYPES = {
+    **{column: 'float32' for column in FLOAT32_COLUMNS if column in CLIENT_COLUMNS},
+    'age_of_client': 'int16',
+    **CATEGORY_DTYPES
+}
+
+# (column, left-closed bin edges, labels) for the AUM/age/tenure/income histograms
+BUCKET_SPECS = [
+    ('current_aum', [0.5, 2, 5, 10, 25, 50, 100, 200, np.inf],
+     ['₹0.5-2 Cr', '₹2-5 Cr', '₹5-10 Cr', '₹10-25 Cr', '₹25-50 Cr', '₹50-100 Cr', '₹100-200 Cr', '₹200+ Cr']),
+    ('age_of_client', [25, 35, 45, 55, 65, np.inf],
+     ['25-35', '35-45', '45-55', '55-65', '65+']),
+    ('client_since', [-np.inf, 1, 3, 5, 10, 15, np.inf],
+     ['< 1 Year', '1-3 Years', '3-5 Years', '5-10 Years', '10-15 Years', '15+ Years']),
+    ('annual_income', [3, 10, 25, 50, 100, np.inf],
+     ['₹3-10 L', '₹10-25 L', '₹25-50 L', '₹50-100 L', '₹100+ L'])
+]
+
+# Client note columns in storage order
+NOTE_COLUMNS = ['client_id', 'note_date', 'note_text', 'note_type', 'priority', 'created_by']
+INSERT_NOTE_SQL = f"INSERT INTO client_notes ({', '.join(NOTE_COLUMNS)}) VALUES ({', '.join('?' * len(NOTE_COLUMNS))})"
+
+# Card style for each note priority (see .note-priority-* in static/advanced.css)
+PRIORITY_CLASSES = {'High': 'note-priority-high', 'Medium': 'note-priority-medium', 'Low': 'note-priority-low'}
+
+# Markup for one entry in the notes list; filled from a notes itertuples row
+NOTE_CARD_HTML = """<div class="note-card {priority_class}">
+<div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;">
+<strong>{note.client_id} - {note.note_type}</strong>
+<span style="font-size: 0.9rem; opacity: 0.8;">{note.note_date} | {note.priority} Priority</span>
+</div>
+<p style="margin: 0;">{note.note_text}</p>
+<div style="margin-top: 0.5rem; font-size: 0.8rem; opacity: 0.7;">
+Created by: {note.created_by}
+</div>
+</div>"""
+
+# Markup for one headline metric card; a row of these is rendered in a single metric-row element
+METRIC_CARD_HTML = """<div class="{card_class}">
+<div class="metric-value">{value}</div>{unit}
+<div class="metric-label">{label}</div>
+</div>"""
+
+# Markup for one selected-client summary card, green when beating the benchmark and red otherwise
+CLIENT_CARD_HTML = """<div class="metric-card" style="background: linear-gradient(135deg, {colors[0]}, {colors[1]});">
+<div class="metric-value">{client.client_name}</div>
+<div class="metric-label">{client.client_id}</div>
+<hr style="margin: 0.5rem 0; border-color: rgba(255,255,255,0.3);">
+<div style="font-size: 1.2rem; font-weight: bold;">₹{client.current_aum:.2f} Cr</div>
+<div style="font-size: 1rem;">{client.annualised_returns:.2f}% Returns</div>
+<div style="font-size: 0.9rem; opacity: 0.8;">{client.portfolio_type} | {client.risk_profile}</div>
+</div>"""
+
+# Substrings that mark a transaction label as money moving in or out
+INFLOW_TERMS = ('investment', 'deposit', 'addition')
+OUTFLOW_TERMS = ('withdrawal', 'redemption', 'fees')
+
+# Risk-return quadrant captions as (x scale, y scale, text, colour) around the means
+QUADRANT_LABELS = [
+    (0.5, 1.2, "Low Risk<br>High Return", "green"),
+    (1.5, 1.2, "High Risk<br>High Return", "orange"),
+    (0.5, 0.8, "Low Risk<br>Low Return", "blue"),
+    (1.5, 0.8, "High Risk<br>Low Return", "red"),
+]
+
+# Above this many clients the per-client scatters plot a fixed random sample
+BACKGROUND_POINT_LIMIT = 5000
+BACKGROUND_SAMPLE_SIZE = 2000
+
+# Static stylesheet shipped alongside this module
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "advanced.css")
+
+@st.cache_resource
+def _get_connection(db_path: str) -> sqlite3.Connection:
+    """Process-wide SQLite connection for the dashboard, opened once in WAL mode"""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA mmap_size=268435456")
+    return conn
+
+@st.cache_data
+def _load_css(path: str) -> str:
+    """Read a stylesheet once per process instead of rebuilding it on every rerun"""
+    with open(path, encoding="utf-8") as css_file:
+        return css_file.read()
+
+def _fused_return_stats(returns, benchmark) -> Tuple[float, float, float, float, float, float]:
+    """Mean, std, correlation and tracking error of two return columns from one set of moments"""
+    stacked = np.vstack([
+        np.asarray(returns, dtype=np.float64),
+        np.asarray(benchmark, dtype=np.float64)
+    ])
+    n = stacked.shape[1]
+    if n == 0:
+        return np.nan, np.nan, np.nan, np.nan, np.nan, np.nan
+
+    # Shift by the first observation so the raw-moment differences below do not
+    # cancel catastrophically when the means are large relative to the spread
+    shift = stacked[:, :1]
+    stacked = stacked - shift
+
+    # Raw moments: row sums plus the 2x2 Gram matrix (sum r², sum b², sum r·b)
+    sums = stacked.sum(axis=1)
+    gram = stacked @ stacked.T
+    mean_r, mean_b = sums / n
+    avg_r, avg_b = mean_r + shift[0, 0], mean_b + shift[1, 0]
+
+    if n < 2:
+        return avg_r, avg_b, np.nan, np.nan, np.nan, np.nan
+
+    # Sample (ddof=1) variances/covariance to match pandas .std()
+    var_r = max((gram[0, 0] - sums[0] * mean_r) / (n - 1), 0.0)
+    var_b = max((gram[1, 1] - sums[1] * mean_b) / (n - 1), 0.0)
+    cov = (gram[0, 1] - sums[0] * mean_b) / (n - 1)
+
+    std_r, std_b = np.sqrt(var_r), np.sqrt(var_b)
+    correlation = cov / (std_r * std_b) if std_r > 0 and std_b > 0 else np.nan
+
+    # var(r - b) = var(r) + var(b) - 2 cov(r, b)
+    tracking_error = np.sqrt(max(var_r + var_b - 2 * cov, 0.0))
+
+    return avg_r, avg_b, std_r, std_b, correlation, tracking_error
+
+@functools.lru_cache(maxsize=4)
+def _generate_sample_clients(n: int = 250, seed: int = 42) -> pd.DataFrame:
+    """Generate the enhanced sample client book once per process"""
+    rng = np.random.default_rng(seed)
+
+    # Enhanced Indian data
+    indian_names = [
+        "Rajesh Sharma", "Priya Patel", "Amit Kumar", "Sunita Singh", "Vikram Gupta",
+        "Anita Joshi", "Suresh Reddy", "Kavita Nair", "Arjun Mehta", "Deepika Iyer",
+        "Rohit Agarwal", "Meera Jain", "Sanjay Verma", "Pooja Bansal", "Kiran Rao",
+        "Neha Chopra", "Ravi Tiwari", "Shweta Malhotra", "Ajay Saxena", "Ritu Bhatt",
+        "Manish Agrawal", "Sneha Kulkarni", "Rahul Desai", "Divya Menon", "Ashok Pandey",
+        "Rekha Sinha", "Nitin Jha", "Swati Mishra", "Gaurav Bhardwaj", "Nisha Yadav",
+        "Arun Krishnan", "Lakshmi Pillai", "Harish Chand", "Geeta Agarwal", "Mohan Lal"
+    ]
+
+    cities = CITIES
+    states = ["Maharashtra", "Delhi", "Karnataka", "Tamil Nadu", "West Bengal", "Telangana", "Gujarat", "Rajasthan"]
+    rm_names = RM_NAMES
+    portfolio_types = PORTFOLIO_TYPES
+    risk_profiles = RISK_PROFILES
+    distributors = ["HDFC Securities", "ICICI Direct", "Zerodha", "Angel Broking", "Kotak Securities", "Motilal Oswal", "Sharekhan"]
+    occupations = OCCUPATIONS
+    investment_objectives = ["Growth", "Income", "Balanced", "Capital Protection", "Tax Saving", "Retirement Planning"]
+
+    # Base return range by portfolio type and risk multiplier range by risk profile
+    return_ranges = {
+        "Equity": (8, 30), "Debt": (4, 12), "Hybrid": (6, 22), "Multi-Asset": (7, 25),
+        "ELSS": (10, 32), "Sectoral": (5, 40), "International": (6, 28)
+    }
+    risk_ranges = {
+        "Conservative": (0.7, 1.0), "Moderate": (0.9, 1.2),
+        "Aggressive": (1.1, 1.5), "Very Aggressive": (1.3, 1.8)
+    }
+
+    # Every column is drawn as a whole array rather than row by row
+    numbers = np.arange(1, n + 1)
+
+    # Enhanced AUM distribution: ultra high net worth, high net worth, affluent, mid-tier, regular
+    tier = np.searchsorted([25, 75, 150, 200], numbers - 1, side='right')
+    current_aum = rng.uniform(np.array([200, 50, 10, 2, 0.5])[tier], np.array([1000, 200, 50, 10, 2])[tier])
+
+    # Calculate financial metrics
+    initial_corpus = current_aum * rng.uniform(0.4, 0.8, n)
+    additions = current_aum * rng.uniform(0.1, 0.6, n)
+    withdrawals = current_aum * rng.uniform(0.02, 0.2, n)
+    net_corpus = initial_corpus + additions - withdrawals
+
+    # Enhanced returns based on portfolio type and risk adjustment
+    type_codes = rng.integers(0, len(portfolio_types), n)
+    risk_codes = rng.integers(0, len(risk_profiles), n)
+    return_low, return_high = np.array([return_ranges[name] for name in portfolio_types]).T
+    risk_low, risk_high = np.array([risk_ranges[name] for name in risk_profiles]).T
+    annualised_returns = (rng.uniform(return_low[type_codes], return_high[type_codes])
+                          * rng.uniform(risk_low[risk_codes], risk_high[risk_codes]))
+
+    # Add market volatility: 15% exceptional performers, then 15% of the rest poor performers
+    exceptional = rng.random(n) < 0.15
+    poor = ~exceptional & (rng.random(n) < 0.15)
+    annualised_returns *= np.select(
+        [exceptional, poor], [rng.uniform(1.3, 2.0, n), rng.uniform(0.2, 0.6, n)], default=1.0
+    )
+
+    # Benchmark and demographics
+    bse_500_benchmark = rng.uniform(8, 18, n)
+    age = rng.integers(25, 80, n)
+    tenures = rng.uniform(0.25, 20, n)
+
+    # Income (lakhs) based on AUM
+    annual_income = np.select(
+        [current_aum > 100, current_aum > 25, current_aum > 5],
+        [rng.uniform(50, 500, n), rng.uniform(20, 100, n), rng.uniform(8, 50, n)],
+        default=rng.uniform(3, 20, n)
+    )
+
+    suffixes = numbers.astype(str)
+    df = pd.DataFrame({
+        'client_id': np.char.add('CL', np.char.zfill(suffixes, 4)),
+        'client_name': np.char.add(np.char.add(rng.choice(indian_names, n), ' '), suffixes),
+        'nav_bucket': current_aum,
+        'age_of_client': age,
+        'client_since': np.round(tenures, 1),
+        'mobile': np.char.add('9', rng.integers(100000000, 999999999, n).astype(str)),
+        'email': np.char.add(np.char.add('client', suffixes), '@example.com'),
+        'distributor_name': rng.choice(distributors, n),
+        'current_aum': np.round(current_aum, 2),
+        'initial_corpus': np.round(initial_corpus, 2),
+        'additions': np.round(additions, 2),
+        'withdrawals': np.round(withdrawals, 2),
+        'net_corpus': np.round(net_corpus, 2),
+        'annualised_returns': np.round(annualised_returns, 2),
+        'bse_500_benchmark_returns': np.round(bse_500_benchmark, 2),
+        'rm_name': rng.choice(rm_names, n),
+        'portfolio_type': np.array(portfolio_types)[type_codes],
+        'risk_profile': np.array(risk_profiles)[risk_codes],
+        'city': rng.choice(cities, n),
+        'state': rng.choice(states, n),
+        'occupation': rng.choice(occupations, n),
+        'annual_income': np.round(annual_income, 2),
+        'investment_objective': rng.choice(investment_objectives, n)
+    })
+
+    # Inception dates from the unrounded tenures in one datetime64 step
+    today = np.datetime64(datetime.now().date(), 'D')
+    inception_dates = today - (tenures * 365).astype(np.int64).astype('timedelta64[D]')
+    df.insert(df.columns.get_loc('nav_bucket') + 1, 'inception_date', inception_dates.astype('datetime64[ns]'))
+
+    # Values carry at most 2 decimals, so compact dtypes halve memory per reduction
+    df[FLOAT32_COLUMNS] = df[FLOAT32_COLUMNS].astype(np.float32)
+    df['age_of_client'] = df['age_of_client'].astype(np.int16)
+
+    # Rows are kept physically grouped by portfolio_type so groupbys on it can
+    # skip re-sorting; anything appending rows must re-sort to keep this order
+    df = df.sort_values('portfolio_type', kind='stable').reset_index(drop=True)
+    for column in ['portfolio_type', 'rm_name']:
+        df[column] = df[column].astype(CATEGORY_DTYPES[column])
+
+    return df
+
+def _bucket_counts(columns: List[np.ndarray], edges: List[List[float]]) -> List[np.ndarray]:
+    """Histogram several columns against their own left-closed bins with a single bincount"""
+    codes = []
+    offset = 0
+    for values, column_edges in zip(columns, edges):
+        column_edges = np.asarray(column_edges, dtype=np.float64)
+        n_bins = len(column_edges) - 1
+        bins = np.searchsorted(column_edges, values, side='right') - 1
+        # Values below the first edge or at/above the last edge fall outside every bucket
+        codes.append(bins[(bins >= 0) & (bins < n_bins)] + offset)
+        offset += n_bins
+    
+    counts = np.bincount(np.concatenate(codes), minlength=offset)
+    splits = np.cumsum([len(column_edges) - 1 for column_edges in edges])[:-1]
+    return np.split(counts, splits)
+
+def _downcast(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrink float64/int64 columns to the narrowest dtype that holds their values"""
+    downcast = {}
+    for column in df.select_dtypes('float64').columns:
+        downcast[column] = pd.to_numeric(df[column], downcast='float')
+    for column in df.select_dtypes('int64').columns:
+        downcast[column] = pd.to_numeric(df[column], downcast='integer')
+    return df.assign(**downcast) if downcast else df
+
+def _observed_counts(values: pd.Series) -> Dict:
+    """Value counts without the zero entries categoricals report for unused categories"""
+    counts = values.value_counts()
+    return counts[counts > 0].to_dict()
+
+def _top_k_positions(values: np.ndarray, k: int, largest: bool = True) -> np.ndarray:
+    """Row positions of the k largest (or smallest) values, best first, by partial selection
+
+    Ties keep row order, as with ``nlargest``/``nsmallest(keep='first')``:
+    every row tied at the k-th value stays a candidate until the stable sort.
+    """
+    k = min(k, len(values))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    keyed = -values if largest else values
+    kth_value = np.partition(keyed, k - 1)[k - 1]
+    candidates = np.flatnonzero(keyed <= kth_value)
+    return candidates[np.argsort(keyed[candidates], kind='stable')[:k]]
+
+def _format_values(values: pd.Series, template: str) -> np.ndarray:
+    """Format a numeric column with a printf-style template in one NumPy call"""
+    return np.char.mod(template, values.to_numpy(dtype=np.float64))
+
+def _frame_digest(df: pd.DataFrame) -> bytes:
+    """Content hash of a DataFrame, used as the cache key for view aggregations"""
+    return pd.util.hash_pandas_object(df, index=True).values.tobytes()
+
+# Results derived from a (filtered) client frame are memoised on its content
+_cache_by_content = st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: _frame_digest})
+
+def _portfolio_stats(data: pd.DataFrame) -> pd.DataFrame:
+    """Average return, risk, AUM and client count per portfolio type"""
+    returns = data['annualised_returns']
+    return group_aggregate(data['portfolio_type'], {
+        'avg_return': (returns, 'mean'),
+        'risk': (returns, 'std'),
+        'total_aum': (data['current_aum'], 'sum'),
+        'client_count': (None, 'size')
+    }, sort=False)
+
+def _portfolio_risk_data(data: pd.DataFrame) -> pd.DataFrame:
+    """AUM and client count per portfolio type and risk profile"""
+    return group_aggregate([data['portfolio_type'], data['risk_profile']], {
+        'total_aum': (data['current_aum'], 'sum'),
+        'client_count': (None, 'size')
+    }, sort=False).reset_index()
+
+def _city_stats(data: pd.DataFrame) -> pd.DataFrame:
+    """AUM, returns and client count per city, largest AUM first"""
+    city_stats = group_aggregate(data['city'], {
+        'total_aum': (data['current_aum'], 'sum'),
+        'avg_returns': (data['annualised_returns'], 'mean'),
+        'client_count': (None, 'size')
+    })
+    return city_stats.sort_values('total_aum', ascending=False)
+
+def _occupation_stats(data: pd.DataFrame) -> pd.DataFrame:
+    """AUM, returns, income and client count per occupation, one row each (occupation as a column)"""
+    aum = data['current_aum']
+    return group_aggregate(data['occupation'], {
+        'total_aum': (aum, 'sum'),
+        'avg_aum': (aum, 'mean'),
+        'avg_returns': (data['annualised_returns'], 'mean'),
+        'avg_income': (data['annual_income'], 'mean'),
+        'client_count': (None, 'size')
+    }).reset_index()
+
+def _rm_returns_matrix(data: pd.DataFrame) -> pd.DataFrame:
+    """Average returns per RM (rows) and portfolio type (columns), 0 where an RM has no clients"""
+    return group_matrix(data['rm_name'], data['portfolio_type'], data['annualised_returns'])
+
+def _rm_stats(data: pd.DataFrame) -> pd.DataFrame:
+    """AUM, returns and client count per RM"""
+    aum = data['current_aum']
+    return group_aggregate(data['rm_name'], {
+        'total_aum': (aum, 'sum'),
+        'avg_aum_per_client': (aum, 'mean'),
+        'avg_returns': (data['annualised_returns'], 'mean'),
+        'client_count': (None, 'size')
+    })
+
+@_cache_by_content
+def _build_cube(data: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """All overview aggregates for one client frame, computed together and cached on its content"""
+    return {
+        'portfolio': _portfolio_stats(data),
+        'portfolio_risk': _portfolio_risk_data(data),
+        'city': _city_stats(data),
+        'occupation': _occupation_stats(data),
+        'rm_returns': _rm_returns_matrix(data),
+        'rm': _rm_stats(data)
+    }
+
+@_cache_by_content
+def _overview_charts(_dashboard, data: pd.DataFrame, metrics: Dict, view_type: str, theme: str) -> Dict:
+    """Overview figures for one (data, view, theme), rebuilt only when one of them changes"""
+    return _dashboard.create_client_overview_charts(data, metrics, view_type, theme)
+
+@_cache_by_content
+def _to_csv_bytes(data: pd.DataFrame) -> bytes:
+    """UTF-8 CSV export of a frame, serialized once per distinct content"""
+    return data.to_csv(index=False).encode('utf-8')
+
+def _flow_direction(label: str) -> str:
+    """Classify a transaction label as 'inflow', 'outflow' or 'other'"""
+    label = label.lower()
+    if any(term in label for term in INFLOW_TERMS):
+        return 'inflow'
+    if any(term in label for term in OUTFLOW_TERMS):
+        return 'outflow'
+    return 'other'
+
+def _client_metric_frame(clients: np.ndarray, metrics: List[str], values: np.ndarray) -> pd.DataFrame:
+    """Long-form (client, metric, value) frame from a clients x metrics value matrix"""
+    return pd.DataFrame({
+        'client': np.repeat(clients, len(metrics)),
+        'metric': np.tile(metrics, len(clients)),
+        'value': values.ravel()
+    })
+
+@_cache_by_content
+def _client_labels(data: pd.DataFrame) -> Dict[str, str]:
+    """Multiselect display labels 'Client Name (CL0001)' keyed by client_id"""
+    labels = data['client_name'].astype(str) + ' (' + data['client_id'].astype(str) + ')'
+    return dict(zip(data['client_id'], labels))
+
+@functools.lru_cache(maxsize=None)
+def _template_json(name: str) -> Dict:
+    """Resolved plotly template as a plain dict, for figures built without validation"""
+    return pio.templates[name].to_plotly_json()
+
+def _figure(traces: List[Dict], template: str, **layout) -> go.Figure:
+    """Figure from literal trace/layout dicts, bypassing Plotly's per-property validation
+
+    Nothing coerces these dicts, so they must already be in canonical form:
+    ``title=dict(text=...)``, arrays rather than Series, colorscales resolved
+    to lists, and shapes/annotations as full dicts instead of add_hline calls.
+    """
+    return go.Figure(dict(data=traces, layout=dict(layout, template=_template_json(template))), _validate=False)
+
+def _axis_line(axis: str, value: float, **line) -> Dict:
+    """Dashed gray reference line across the plot at x=value ('x') or y=value ('y'), as add_vline/add_hline draw it"""
+    shape = dict(type='line', line=dict(dash='dash', color='gray'), opacity=0.5, **line)
+    if axis == 'x':
+        return dict(shape, xref='x', yref='y domain', x0=value, x1=value, y0=0, y1=1)
+    return dict(shape, xref='x domain', yref='y', x0=0, x1=1, y0=value, y1=value)
+
 class AdvancedAnalyticsDashboard:
     """Advanced Analytics Dashboard with comprehensive graphical overviews"""
     
@@ -42,7 +507,7 @@ class AdvancedAnalyticsDashboard:
         
     def init_database(self):
         """Initialize comprehensive database schema"""
-        conn = sqlite3.connect(self.db_path)
+        conn = _get_connection(self.db_path)
         cursor = conn.cursor()
         
         # Enhanced clients table
@@ -107,19 +572,15 @@ class AdvancedAnalyticsDashboard:
             )
         ''')
         
-        # Create comprehensive indexes
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_clients_rm ON clients(rm_name)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_clients_portfolio ON clients(portfolio_type)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_clients_aum ON clients(current_aum)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_clients_risk ON clients(risk_profile)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_clients_city ON clients(city)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_notes_client ON client_notes(client_id)')
+        # Indexes backing the notes/performance lookups (load_notes matches client_id, then ranges
+        # and orders on note_date); clients is only ever read in full, so indexing its columns
+        # would just slow down the sample-data reload
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_notes_client_date ON client_notes(client_id, note_date)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_notes_date ON client_notes(note_date)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_performance_client ON performance_history(client_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_performance_date ON performance_history(date)')
         
         conn.commit()
-        conn.close()
     
     def render_client_overview(self, data: pd.DataFrame):
         """Render comprehensive client overview with multiple analytical perspectives"""
@@ -127,37 +588,22 @@ class AdvancedAnalyticsDashboard:
         st.markdown("## 📊 Client Overview - Comprehensive Analytics")
         st.markdown("Analyze your portfolio from multiple perspectives with advanced visualizations.")
         
-        # Control panel
-        col1, col2, col3 = st.columns([2, 1, 1])
-        
-        with col1:
-            view_type = st.selectbox(
-                "Select Analysis View",
-                ["Performance Analysis", "Portfolio Composition", "Geographic Analysis", 
-                 "Demographic Analysis", "RM Performance"]
-            )
-        
-        with col2:
-            chart_theme = st.selectbox(
-                "Chart Theme",
-                ["default", "dark", "minimal", "presentation"]
-            )
-        
-        with col3:
-            show_filters = st.checkbox("Show Advanced Filters", value=True)
+        # Control panel (view and theme selectors live with the charts below)
+        show_filters = st.checkbox("Show Advanced Filters", value=True)
         
         # Advanced filters
         if show_filters:
             with st.expander("🔍 Advanced Filters", expanded=True):
                 filter_col1, filter_col2, filter_col3, filter_col4 = st.columns(4)
                 
+                # Filter keys are categorical, so their options are read off the dtype without a scan
                 with filter_col1:
-                    rm_filter = st.multiselect("Relationship Manager", data['rm_name'].unique())
-                    portfolio_filter = st.multiselect("Portfolio Type", data['portfolio_type'].unique())
+                    rm_filter = st.multiselect("Relationship Manager", data['rm_name'].cat.categories)
+                    portfolio_filter = st.multiselect("Portfolio Type", data['portfolio_type'].cat.categories)
                 
                 with filter_col2:
-                    risk_filter = st.multiselect("Risk Profile", data['risk_profile'].unique())
-                    city_filter = st.multiselect("City", data['city'].unique())
+                    risk_filter = st.multiselect("Risk Profile", data['risk_profile'].cat.categories)
+                    city_filter = st.multiselect("City", data['city'].cat.categories)
                 
                 with filter_col3:
                     aum_range = st.slider(
@@ -175,24 +621,17 @@ class AdvancedAnalyticsDashboard:
                         (float(data['annualised_returns'].min()), float(data['annualised_returns'].max()))
                     )
                 
-                # Apply filters
-                filtered_data = data.copy()
-                
-                if rm_filter:
-                    filtered_data = filtered_data[filtered_data['rm_name'].isin(rm_filter)]
-                if portfolio_filter:
-                    filtered_data = filtered_data[filtered_data['portfolio_type'].isin(portfolio_filter)]
-                if risk_filter:
-                    filtered_data = filtered_data[filtered_data['risk_profile'].isin(risk_filter)]
-                if city_filter:
-                    filtered_data = filtered_data[filtered_data['city'].isin(city_filter)]
+                # Apply filters as one combined mask, indexing the frame once
+                mask = (
+                    data['current_aum'].between(*aum_range).to_numpy() &
+                    data['annualised_returns'].between(*returns_range).to_numpy()
+                )
+                for column, selected in (('rm_name', rm_filter), ('portfolio_type', portfolio_filter),
+                                         ('risk_profile', risk_filter), ('city', city_filter)):
+                    if selected:
+                        mask &= data[column].isin(selected).to_numpy()
                 
-                filtered_data = filtered_data[
-                    (filtered_data['current_aum'] >= aum_range[0]) &
-                    (filtered_data['current_aum'] <= aum_range[1]) &
-                    (filtered_data['annualised_returns'] >= returns_range[0]) &
-                    (filtered_data['annualised_returns'] <= returns_range[1])
-                ]
+                filtered_data = data if mask.all() else data[mask]
         else:
             filtered_data = data
         
@@ -203,66 +642,24 @@ class AdvancedAnalyticsDashboard:
         # Calculate metrics
         metrics = self.calculate_comprehensive_metrics(filtered_data)
         
-        # Key metrics display with fixed text overflow
-        col1, col2, col3, col4, col5, col6 = st.columns(6)
-        
-        with col1:
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-value">₹{metrics['total_aum']:.1f}</div>
-                <div class="metric-unit">Cr</div>
-                <div class="metric-label">Total AUM</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-value">{metrics['total_clients']}</div>
-                <div class="metric-label">Total Clients</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-value">{metrics['avg_returns']:.2f}%</div>
-                <div class="metric-label">Avg Returns</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col4:
-            st.markdown(f"""
-            <div class="advanced-metric">
-                <div class="metric-value">{metrics['alpha']:.2f}%</div>
-                <div class="metric-label">Alpha</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col5:
-            st.markdown(f"""
-            <div class="advanced-metric">
-                <div class="metric-value">{metrics['sharpe_ratio']:.2f}</div>
-                <div class="metric-label">Sharpe Ratio</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col6:
-            st.markdown(f"""
-            <div class="advanced-metric">
-                <div class="metric-value">{metrics['beta']:.2f}</div>
-                <div class="metric-label">Beta</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        # Create and display charts
-        charts = self.create_client_overview_charts(filtered_data, metrics, view_type, chart_theme)
+        # Key metrics display with fixed text overflow, as one row element
+        metric_cards = [
+            ('metric-card', f"₹{metrics['total_aum']:.1f}", 'Cr', 'Total AUM'),
+            ('metric-card', metrics['total_clients'], None, 'Total Clients'),
+            ('metric-card', f"{metrics['avg_returns']:.2f}%", None, 'Avg Returns'),
+            ('advanced-metric', f"{metrics['alpha']:.2f}%", None, 'Alpha'),
+            ('advanced-metric', f"{metrics['sharpe_ratio']:.2f}", None, 'Sharpe Ratio'),
+            ('advanced-metric', f"{metrics['beta']:.2f}", None, 'Beta')
+        ]
+        st.markdown('<div class="metric-row">' + ''.join(
+            METRIC_CARD_HTML.format(
+                card_class=card_class, value=value, label=label,
+                unit=f'\n<div class="metric-unit">{unit}</div>' if unit else ''
+            )
+            for card_class, value, unit, label in metric_cards
+        ) + '</div>', unsafe_allow_html=True)
         
-        # Display charts based on view type
-        for chart_name, chart in charts.items():
-            st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-            st.plotly_chart(chart, use_container_width=True)
-            st.markdown('</div>', unsafe_allow_html=True)
+        self.render_overview_charts(filtered_data, metrics)
         
         # Client details table
         st.markdown("## 📋 Detailed Client Information")
@@ -271,9 +668,9 @@ class AdvancedAnalyticsDashboard:
         search_term = st.text_input("🔍 Search clients by name, ID, or RM:")
         if search_term:
             mask = (
-                filtered_data['client_name'].str.contains(search_term, case=False, na=False) |
-                filtered_data['client_id'].str.contains(search_term, case=False, na=False) |
-                filtered_data['rm_name'].str.contains(search_term, case=False, na=False)
+                filtered_data['client_name'].str.contains(search_term, case=False, na=False, regex=False) |
+                filtered_data['client_id'].str.contains(search_term, case=False, na=False, regex=False) |
+                filtered_data['rm_name'].str.contains(search_term, case=False, na=False, regex=False)
             )
             filtered_data = filtered_data[mask]
         
@@ -284,11 +681,38 @@ class AdvancedAnalyticsDashboard:
         ]
         
         display_data = filtered_data[display_columns].copy()
-        display_data['current_aum'] = display_data['current_aum'].apply(lambda x: f"₹{x:.2f} Cr")
-        display_data['annualised_returns'] = display_data['annualised_returns'].apply(lambda x: f"{x:.2f}%")
+        display_data['current_aum'] = _format_values(display_data['current_aum'], '₹%.2f Cr')
+        display_data['annualised_returns'] = _format_values(display_data['annualised_returns'], '%.2f%%')
         
         st.dataframe(display_data, use_container_width=True, height=400)
     
+    @st.fragment
+    def render_overview_charts(self, data: pd.DataFrame, metrics: Dict):
+        """View/theme selectors and overview charts; changing either reruns only this fragment"""
+        col1, col2 = st.columns([2, 1])
+        
+        with col1:
+            view_type = st.selectbox(
+                "Select Analysis View",
+                ["Performance Analysis", "Portfolio Composition", "Geographic Analysis", 
+                 "Demographic Analysis", "RM Performance"]
+            )
+        
+        with col2:
+            chart_theme = st.selectbox(
+                "Chart Theme",
+                ["default", "dark", "minimal", "presentation"]
+            )
+        
+        # Create and display charts
+        charts = _overview_charts(self, data, metrics, view_type, chart_theme)
+        
+        # Display charts based on view type
+        for chart_name, chart in charts.items():
+            st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+            st.plotly_chart(chart, use_container_width=True)
+            st.markdown('</div>', unsafe_allow_html=True)
+    
     def render_client_flows(self, data: pd.DataFrame):
         """Render client flows analysis with multiple perspectives"""
         
@@ -296,7 +720,7 @@ class AdvancedAnalyticsDashboard:
         st.markdown("Analyze transaction patterns, cash flows, and client behavior trends.")
         
         # Load flows data
-        flows_data = self.flows_tracker.load_flows_data()
+        flows_data = self.load_flows()
         
         if len(flows_data) > 0:
             # Flow view controls
@@ -322,7 +746,7 @@ class AdvancedAnalyticsDashboard:
                 with flow_col1:
                     transaction_type_filter = st.multiselect(
                         "Transaction Type", 
-                        flows_data['transaction_label'].unique()
+                        flows_data['transaction_label'].cat.categories
                     )
                 
                 with flow_col2:
@@ -349,11 +773,10 @@ class AdvancedAnalyticsDashboard:
             
             if len(flow_date_range) == 2:
                 start_date, end_date = flow_date_range
-                filtered_flows['transaction_date'] = pd.to_datetime(filtered_flows['transaction_date'])
-                filtered_flows = filtered_flows[
-                    (filtered_flows['transaction_date'].dt.date >= start_date) &
-                    (filtered_flows['transaction_date'].dt.date <= end_date)
-                ]
+                # Compare datetime64 against the half-open day range instead of building date objects
+                filtered_flows = filtered_flows[filtered_flows['transaction_date'].between(
+                    pd.Timestamp(start_date), pd.Timestamp(end_date) + pd.Timedelta(days=1), inclusive='left'
+                )]
             
             # Create and display flow charts
             flow_charts = self.create_client_flows_charts(filtered_flows, flow_view_type, flow_chart_theme)
@@ -366,12 +789,14 @@ class AdvancedAnalyticsDashboard:
             # Flow summary table
             st.markdown("## 📋 Transaction Summary")
             
-            summary_data = filtered_flows.groupby(['client_id', 'transaction_label']).agg({
-                'amount': ['sum', 'count'],
+            summary_data = filtered_flows.groupby(['client_id', 'transaction_label'], observed=True).agg({
+                'amount': ['sum', 'size'],
                 'transaction_date': ['min', 'max']
-            }).round(2)
+            })
             
             summary_data.columns = ['Total Amount', 'Transaction Count', 'First Transaction', 'Last Transaction']
+            # Only the amount needs rounding; round() over the date columns warns on every render
+            summary_data['Total Amount'] = summary_data['Total Amount'].round(2)
             summary_data = summary_data.reset_index()
             
             st.dataframe(summary_data, use_container_width=True, height=400)
@@ -381,756 +806,224 @@ class AdvancedAnalyticsDashboard:
             
             # Generate sample flows button
             if st.button("Generate Sample Flow Data"):
-                self.flows_tracker.generate_sample_flows()
-                st.success("Sample flow data generated! Please refresh the page.")
+                sample_flows = self.flows_tracker.generate_sample_flows(data['client_id'].tolist()[:50], 300)
+                self.flows_tracker.save_flows_to_db(sample_flows)
+                
+                # Drop the cached flows so the rerun reads the new rows
+                self.load_flows.clear()
                 st.rerun()
     
     def render_advanced_css(self):
         """Apply comprehensive CSS styling with professional logo"""
-        st.markdown("""
-        <style>
-        /* Import Google Fonts */
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-        
-        /* Global Styles */
-        .main {
-            font-family: 'Inter', sans-serif;
-        }
-        
-        /* Header with Logo */
-        .main-header {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 1.5rem 2rem;
-            border-radius: 15px;
-            margin-bottom: 2rem;
-            box-shadow: 0 8px 32px rgba(102, 126, 234, 0.3);
-            display: flex;
-            align-items: center;
-            gap: 1rem;
-        }
-        
-        .logo-container {
-            display: flex;
-            align-items: center;
-            gap: 1rem;
-        }
-        
-        .logo-icon {
-            width: 60px;
-            height: 60px;
-            background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-            border-radius: 12px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 2rem;
-            color: white;
-            font-weight: bold;
-            box-shadow: 0 4px 15px rgba(79, 172, 254, 0.4);
-        }
-        
-        .header-text {
-            flex: 1;
-        }
-        
-        .header-title {
-            font-size: 2.5rem;
-            font-weight: 700;
-            margin: 0;
-            text-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-        
-        .header-subtitle {
-            font-size: 1.1rem;
-            opacity: 0.9;
-            margin: 0.5rem 0 0 0;
-            font-weight: 400;
-        }
-        
-        /* Fixed Metric Cards */
-        .metric-card {
-            background: linear-gradient(135deg, #667eea, #764ba2);
-            color: white;
-            padding: 1.5rem;
-            border-radius: 15px;
-            text-align: center;
-            box-shadow: 0 8px 32px rgba(102, 126, 234, 0.3);
-            margin-bottom: 1rem;
-            min-height: 120px;
-            display: flex;
-            flex-direction: column;
-            justify-content: center;
-            word-wrap: break-word;
-            overflow: hidden;
-        }
-        
-        .metric-value {
-            font-size: 2.2rem;
-            font-weight: 700;
-            margin-bottom: 0.3rem;
-            line-height: 1.1;
-            word-break: break-word;
-        }
-        
-        .metric-unit {
-            font-size: 1.2rem;
-            font-weight: 500;
-            opacity: 0.9;
-            margin-bottom: 0.3rem;
-        }
-        
-        .metric-label {
-            font-size: 0.9rem;
-            opacity: 0.8;
-            font-weight: 500;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-            line-height: 1.2;
-        }
-        
-        .advanced-metric {
-            background: linear-gradient(135deg, #4facfe, #00f2fe);
-            color: white;
-            padding: 1.5rem;
-            border-radius: 15px;
-            text-align: center;
-            box-shadow: 0 8px 32px rgba(79, 172, 254, 0.3);
-            margin-bottom: 1rem;
-            min-height: 120px;
-            display: flex;
-            flex-direction: column;
-            justify-content: center;
-            word-wrap: break-word;
-            overflow: hidden;
-        }
-        
-        .advanced-metric .metric-value {
-            font-size: 2.2rem;
-            font-weight: 700;
-            margin-bottom: 0.3rem;
-            line-height: 1.1;
-            word-break: break-word;
-        }
-        
-        .advanced-metric .metric-label {
-            font-size: 0.9rem;
-            opacity: 0.8;
-            font-weight: 500;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-            line-height: 1.2;
-        }
-        
-        /* Chart Containers */
-        .chart-container {
-            background: white;
-            border-radius: 15px;
-            padding: 1.5rem;
-            margin-bottom: 2rem;
-            box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-            border: 1px solid #e1e5e9;
-        }
-        
-        /* Notes Cards */
-        .note-card {
-            background: #f8f9fa;
-            border-left: 4px solid #667eea;
-            padding: 1rem;
-            margin-bottom: 1rem;
-            border-radius: 8px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        }
-        
-        /* Responsive Design */
-        @media (max-width: 768px) {
-            .header-title {
-                font-size: 1.8rem;
-            }
-            
-            .header-subtitle {
-                font-size: 1rem;
-            }
-            
-            .logo-icon {
-                width: 50px;
-                height: 50px;
-                font-size: 1.5rem;
-            }
-            
-            .metric-value {
-                font-size: 1.8rem;
-            }
-            
-            .metric-label {
-                font-size: 0.8rem;
-            }
-        }
-        
-        /* Sidebar Styling */
-        .css-1d391kg {
-            background: linear-gradient(180deg, #f8f9fa 0%, #e9ecef 100%);
-        }
-        
-        /* Tab Styling */
-        .stTabs [data-baseweb="tab-list"] {
-            gap: 8px;
-        }
-        
-        .stTabs [data-baseweb="tab"] {
-            height: 50px;
-            padding-left: 20px;
-            padding-right: 20px;
-            background-color: #f8f9fa;
-            border-radius: 10px;
-            color: #495057;
-            font-weight: 500;
-        }
-        
-        .stTabs [aria-selected="true"] {
-            background: linear-gradient(135deg, #667eea, #764ba2);
-            color: white;
-        }
-        
-        /* Button Styling */
-        .stButton > button {
-            background: linear-gradient(135deg, #667eea, #764ba2);
-            color: white;
-            border: none;
-            border-radius: 10px;
-            padding: 0.5rem 1rem;
-            font-weight: 500;
-            transition: all 0.3s ease;
-        }
-        
-        .stButton > button:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4);
-        }
-        
-        /* Selectbox Styling */
-        .stSelectbox > div > div {
-            border-radius: 10px;
-            border: 2px solid #e1e5e9;
-        }
-        
-        /* Multiselect Styling */
-        .stMultiSelect > div > div {
-            border-radius: 10px;
-            border: 2px solid #e1e5e9;
-        }
-        
-        /* Dataframe Styling */
-        .dataframe {
-            border-radius: 10px;
-            overflow: hidden;
-            box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-        }
-        
-        /* Success/Error Messages */
-        .stSuccess {
-            background: linear-gradient(135deg, #51cf66, #40c057);
-            color: white;
-            border-radius: 10px;
-        }
-        
-        .stError {
-            background: linear-gradient(135deg, #ff6b6b, #ee5a52);
-            color: white;
-            border-radius: 10px;
-        }
-        
-        .stInfo {
-            background: linear-gradient(135deg, #4dabf7, #339af0);
-            color: white;
-            border-radius: 10px;
-        }
-        
-        .stWarning {
-            background: linear-gradient(135deg, #ffd43b, #fab005);
-            color: white;
-            border-radius: 10px;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-    
-    def load_data(self) -> pd.DataFrame:
-            font-size: 3.5rem;
-            font-weight: bold;
-            text-align: center;
-            background: linear-gradient(90deg, #1e3a8a, #3b82f6, #8b5cf6, #ec4899);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            margin-bottom: 2rem;
-            animation: gradient 4s ease-in-out infinite;
-            background-size: 400% 400%;
-        }
-        
-        @keyframes gradient {
-            0%, 100% { background-position: 0% 50%; }
-            50% { background-position: 100% 50%; }
-        }
-        
-        .metric-card {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            padding: 1.5rem;
-            border-radius: 20px;
-            color: white;
-            text-align: center;
-            box-shadow: 0 10px 40px rgba(0,0,0,0.15);
-            margin-bottom: 1.5rem;
-            transition: all 0.3s ease;
-            border: 1px solid rgba(255,255,255,0.1);
-            min-height: 140px;
-            display: flex;
-            flex-direction: column;
-            justify-content: center;
-            overflow: hidden;
-        }
-        
-        .metric-card:hover {
-            transform: translateY(-8px) scale(1.02);
-            box-shadow: 0 20px 60px rgba(0,0,0,0.25);
-        }
-        
-        .metric-value {
-            font-size: 2.2rem;
-            font-weight: bold;
-            margin-bottom: 0.5rem;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-            word-wrap: break-word;
-            line-height: 1.1;
-        }
-        
-        .metric-label {
-            font-size: 1rem;
-            opacity: 0.9;
-            font-weight: 500;
-            word-wrap: break-word;
-        }
-        
-        .chart-container {
-            background: white;
-            padding: 2rem;
-            border-radius: 20px;
-            box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-            margin-bottom: 2rem;
-            border: 1px solid #e2e8f0;
-            transition: all 0.3s ease;
-        }
-        
-        .chart-container:hover {
-            box-shadow: 0 12px 40px rgba(0,0,0,0.15);
-            transform: translateY(-2px);
-        }
-        
-        .advanced-metric {
-            background: linear-gradient(135deg, #ff6b6b, #feca57);
-            padding: 1.5rem;
-            border-radius: 15px;
-            color: white;
-            text-align: center;
-            margin-bottom: 1rem;
-            box-shadow: 0 4px 16px rgba(0,0,0,0.1);
-        }
-        
-        .performance-indicator {
-            background: linear-gradient(135deg, #48cae4, #023e8a);
-            padding: 1rem;
-            border-radius: 10px;
-            color: white;
-            text-align: center;
-            margin: 0.5rem 0;
-            font-weight: 600;
-        }
-        
-        .view-selector {
-            background: #f8fafc;
-            padding: 1rem;
-            border-radius: 15px;
-            margin-bottom: 2rem;
-            border: 2px solid #e2e8f0;
-        }
-        
-        .filter-section {
-            background: linear-gradient(135deg, #f8fafc, #e2e8f0);
-            padding: 1.5rem;
-            border-radius: 15px;
-            margin-bottom: 2rem;
-            border: 1px solid #cbd5e1;
-        }
-        
-        .sidebar .sidebar-content {
-            background: linear-gradient(180deg, #f8fafc 0%, #e2e8f0 100%);
-        }
-        
-        .stSelectbox > div > div {
-            background-color: #f8fafc;
-            border-radius: 12px;
-            border: 2px solid #e2e8f0;
-            transition: all 0.3s ease;
-        }
-        
-        .stSelectbox > div > div:hover {
-            border-color: #3b82f6;
-            box-shadow: 0 0 0 3px rgba(59, 130, 246, 0.1);
-        }
-        
-        .stButton > button {
-            background: linear-gradient(135deg, #1e3a8a, #3b82f6);
-            color: white;
-            border-radius: 12px;
-            border: none;
-            padding: 0.75rem 1.5rem;
-            font-weight: 600;
-            transition: all 0.3s ease;
-            box-shadow: 0 4px 12px rgba(59, 130, 246, 0.3);
-        }
-        
-        .stButton > button:hover {
-            background: linear-gradient(135deg, #1e40af, #2563eb);
-            transform: translateY(-2px);
-            box-shadow: 0 8px 24px rgba(59, 130, 246, 0.4);
-        }
-        
-        .dataframe {
-            border-radius: 15px;
-            overflow: hidden;
-            box-shadow: 0 4px 16px rgba(0,0,0,0.1);
-            border: 1px solid #e2e8f0;
-        }
-        
-        .stTabs [data-baseweb="tab-list"] {
-            gap: 12px;
-            background: linear-gradient(135deg, #f8fafc, #e2e8f0);
-            padding: 1rem;
-            border-radius: 15px;
-            border: 1px solid #cbd5e1;
-        }
-        
-        .stTabs [data-baseweb="tab"] {
-            background-color: white;
-            border-radius: 12px;
-            padding: 0.75rem 1.5rem;
-            border: 2px solid #e2e8f0;
-            font-weight: 600;
-            transition: all 0.3s ease;
-        }
-        
-        .stTabs [data-baseweb="tab"]:hover {
-            border-color: #3b82f6;
-            transform: translateY(-1px);
-        }
-        
-        .stTabs [aria-selected="true"] {
-            background: linear-gradient(135deg, #1e3a8a, #3b82f6);
-            color: white;
-            border-color: #3b82f6;
-            box-shadow: 0 4px 12px rgba(59, 130, 246, 0.3);
-        }
-        
-        .top-performer {
-            background: linear-gradient(135deg, #10b981, #059669);
-            padding: 1rem;
-            border-radius: 10px;
-            color: white;
-            margin-bottom: 0.5rem;
-            box-shadow: 0 4px 12px rgba(16, 185, 129, 0.3);
-        }
-        
-        .risk-indicator {
-            padding: 0.5rem 1rem;
-            border-radius: 20px;
-            font-weight: bold;
-            text-align: center;
-            margin: 0.25rem;
-            transition: all 0.3s ease;
-        }
-        
-        .risk-indicator:hover {
-            transform: scale(1.05);
-        }
-        
-        .risk-conservative { background: #10b981; color: white; }
-        .risk-moderate { background: #f59e0b; color: white; }
-        .risk-aggressive { background: #ef4444; color: white; }
-        .risk-very-aggressive { background: #dc2626; color: white; }
-        
-        .note-card {
-            background: white;
-            padding: 1rem;
-            border-radius: 10px;
-            border-left: 4px solid #3b82f6;
-            margin-bottom: 1rem;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        }
-        
-        .note-priority-high { border-left-color: #ef4444; }
-        .note-priority-medium { border-left-color: #f59e0b; }
-        .note-priority-low { border-left-color: #10b981; }
-        
-        .chart-controls {
-            background: #f1f5f9;
-            padding: 1rem;
-            border-radius: 10px;
-            margin-bottom: 1rem;
-            border: 1px solid #cbd5e1;
-        }
-        </style>
-        """, unsafe_allow_html=True)
+        st.markdown(f"<style>{_load_css(CSS_PATH)}</style>", unsafe_allow_html=True)
     
-    @st.cache_data
-    def load_enhanced_sample_data(_self) -> pd.DataFrame:
+    def load_enhanced_sample_data(self) -> pd.DataFrame:
         """Load enhanced sample data with comprehensive client information"""
-        np.random.seed(42)
-        
-        # Enhanced Indian data
-        indian_names = [
-            "Rajesh Sharma", "Priya Patel", "Amit Kumar", "Sunita Singh", "Vikram Gupta",
-            "Anita Joshi", "Suresh Reddy", "Kavita Nair", "Arjun Mehta", "Deepika Iyer",
-            "Rohit Agarwal", "Meera Jain", "Sanjay Verma", "Pooja Bansal", "Kiran Rao",
-            "Neha Chopra", "Ravi Tiwari", "Shweta Malhotra", "Ajay Saxena", "Ritu Bhatt",
-            "Manish Agrawal", "Sneha Kulkarni", "Rahul Desai", "Divya Menon", "Ashok Pandey",
-            "Rekha Sinha", "Nitin Jha", "Swati Mishra", "Gaurav Bhardwaj", "Nisha Yadav",
-            "Arun Krishnan", "Lakshmi Pillai", "Harish Chand", "Geeta Agarwal", "Mohan Lal"
-        ]
-        
-        cities = ["Mumbai", "Delhi", "Bangalore", "Chennai", "Kolkata", "Hyderabad", "Pune", "Ahmedabad", "Surat", "Jaipur"]
-        states = ["Maharashtra", "Delhi", "Karnataka", "Tamil Nadu", "West Bengal", "Telangana", "Gujarat", "Rajasthan"]
-        rm_names = ["Rajesh Kumar", "Priya Sharma", "Amit Patel", "Sunita Gupta", "Vikram Singh", "Neha Agarwal", "Rohit Jain"]
-        portfolio_types = ["Equity", "Debt", "Hybrid", "Multi-Asset", "ELSS", "Sectoral", "International"]
-        risk_profiles = ["Conservative", "Moderate", "Aggressive", "Very Aggressive"]
-        distributors = ["HDFC Securities", "ICICI Direct", "Zerodha", "Angel Broking", "Kotak Securities", "Motilal Oswal", "Sharekhan"]
-        occupations = ["Business", "Service", "Professional", "Retired", "Government", "Self-Employed"]
-        investment_objectives = ["Growth", "Income", "Balanced", "Capital Protection", "Tax Saving", "Retirement Planning"]
-        
-        data = []
-        for i in range(250):  # Increased to 250 clients for better analysis
-            client_id = f"CL{i+1:04d}"
-            
-            # Enhanced AUM distribution
-            if i < 25:  # Ultra high net worth
-                current_aum = np.random.uniform(200, 1000)
-            elif i < 75:  # High net worth
-                current_aum = np.random.uniform(50, 200)
-            elif i < 150:  # Affluent
-                current_aum = np.random.uniform(10, 50)
-            elif i < 200:  # Mid-tier
-                current_aum = np.random.uniform(2, 10)
-            else:  # Regular
-                current_aum = np.random.uniform(0.5, 2)
-            
-            # Calculate financial metrics
-            initial_corpus = current_aum * np.random.uniform(0.4, 0.8)
-            additions = current_aum * np.random.uniform(0.1, 0.6)
-            withdrawals = current_aum * np.random.uniform(0.02, 0.2)
-            net_corpus = initial_corpus + additions - withdrawals
-            
-            # Enhanced returns based on multiple factors
-            portfolio_type = np.random.choice(portfolio_types)
-            risk_profile = np.random.choice(risk_profiles)
-            
-            # Base returns by portfolio type
-            base_returns = {
-                "Equity": np.random.uniform(8, 30),
-                "Debt": np.random.uniform(4, 12),
-                "Hybrid": np.random.uniform(6, 22),
-                "Multi-Asset": np.random.uniform(7, 25),
-                "ELSS": np.random.uniform(10, 32),
-                "Sectoral": np.random.uniform(5, 40),
-                "International": np.random.uniform(6, 28)
-            }[portfolio_type]
-            
-            # Risk adjustment
-            risk_multiplier = {
-                "Conservative": np.random.uniform(0.7, 1.0),
-                "Moderate": np.random.uniform(0.9, 1.2),
-                "Aggressive": np.random.uniform(1.1, 1.5),
-                "Very Aggressive": np.random.uniform(1.3, 1.8)
-            }[risk_profile]
-            
-            annualised_returns = base_returns * risk_multiplier
-            
-            # Add market volatility
-            if np.random.random() < 0.15:  # 15% exceptional performers
-                annualised_returns *= np.random.uniform(1.3, 2.0)
-            elif np.random.random() < 0.15:  # 15% poor performers
-                annualised_returns *= np.random.uniform(0.2, 0.6)
-            
-            # Benchmark and demographics
-            bse_500_benchmark = np.random.uniform(8, 18)
-            age = np.random.randint(25, 80)
-            client_since = np.random.uniform(0.25, 20)
-            inception_date = (datetime.now() - timedelta(days=int(client_since * 365))).strftime('%Y-%m-%d')
-            
-            # Income based on AUM
-            if current_aum > 100:
-                annual_income = np.random.uniform(50, 500)  # Lakhs
-            elif current_aum > 25:
-                annual_income = np.random.uniform(20, 100)
-            elif current_aum > 5:
-                annual_income = np.random.uniform(8, 50)
-            else:
-                annual_income = np.random.uniform(3, 20)
-            
-            data.append({
-                'client_id': client_id,
-                'client_name': np.random.choice(indian_names) + f" {i+1}",
-                'nav_bucket': current_aum,
-                'inception_date': inception_date,
-                'age_of_client': age,
-                'client_since': round(client_since, 1),
-                'mobile': f"9{np.random.randint(100000000, 999999999)}",
-                'email': f"client{i+1}@example.com",
-                'distributor_name': np.random.choice(distributors),
-                'current_aum': round(current_aum, 2),
-                'initial_corpus': round(initial_corpus, 2),
-                'additions': round(additions, 2),
-                'withdrawals': round(withdrawals, 2),
-                'net_corpus': round(net_corpus, 2),
-                'annualised_returns': round(annualised_returns, 2),
-                'bse_500_benchmark_returns': round(bse_500_benchmark, 2),
-                'rm_name': np.random.choice(rm_names),
-                'portfolio_type': portfolio_type,
-                'risk_profile': risk_profile,
-                'city': np.random.choice(cities),
-                'state': np.random.choice(states),
-                'occupation': np.random.choice(occupations),
-                'annual_income': round(annual_income, 2),
-                'investment_objective': np.random.choice(investment_objectives)
-            })
-        
-        return pd.DataFrame(data)
+        # Copy so callers cannot mutate the frame shared across sessions
+        return _generate_sample_clients().copy()
     
     @st.cache_data
     def load_data(_self) -> pd.DataFrame:
         """Load data from database or create enhanced sample data"""
-        conn = sqlite3.connect(_self.db_path)
-        
-        try:
-            data = pd.read_sql_query("SELECT * FROM clients", conn)
-            if len(data) == 0:
-                raise ValueError("No data in database")
-        except:
+        conn = _get_connection(_self.db_path)
+        
+        # A clients table written by another tool with a different schema is rebuilt, as the
+        # sample-data fallback always did, rather than failing the projected read below
+        stored_columns = {row[1] for row in conn.execute("PRAGMA table_info(clients)")}
+        if not stored_columns.issuperset(CLIENT_RECORD_COLUMNS):
+            with conn:
+                conn.execute("DROP TABLE IF EXISTS clients")
+            _self.init_database()
+        
+        # init_database has created the schema, so an empty table is filled in place once
+        # Rows come back grouped by portfolio_type in insertion order, the order _generate_sample_clients builds
+        data = pd.read_sql_query(
+            f"SELECT {', '.join(CLIENT_COLUMNS)} FROM clients ORDER BY portfolio_type, id", conn, dtype=CLIENT_DTYPES
+        )
+        if len(data) == 0:
             sample_data = _self.load_enhanced_sample_data()
-            sample_data.to_sql('clients', conn, if_exists='replace', index=False)
-            data = sample_data
+            sample_data.to_sql('clients', conn, if_exists='append', index=False)
+            data = sample_data[CLIENT_COLUMNS].astype(CLIENT_DTYPES)
         
-        conn.close()
         return data
+
+    def load_client_rows(self, client_ids: List[str]) -> pd.DataFrame:
+        """Full stored rows for the given clients, in the order given, for exports"""
+        placeholders = ', '.join('?' * len(client_ids))
+        rows = pd.read_sql_query(
+            f"SELECT {', '.join(CLIENT_RECORD_COLUMNS)} FROM clients WHERE client_id IN ({placeholders})",
+            _get_connection(self.db_path), params=list(client_ids)
+        )
+        return rows.set_index('client_id', drop=False).reindex(client_ids).reset_index(drop=True)
+
+    @st.cache_data(ttl=300)
+    def load_flows(_self) -> pd.DataFrame:
+        """Load client flows with calendar fields derived once at load time; cached for five minutes"""
+        flows_data = _downcast(_self.flows_tracker.load_flows_data())
+        if len(flows_data) > 0:
+            transaction_date = flows_data['transaction_date']
+            flows_data = flows_data.assign(
+                month=transaction_date.dt.month.astype('int8'),
+                month_start=transaction_date.values.astype('datetime64[M]').astype('datetime64[ns]'),
+                quarter=transaction_date.dt.quarter.astype('int8'),
+                transaction_label=flows_data['transaction_label'].astype('category')
+            )
+        return flows_data
+
+    @st.cache_resource
+    def seed_sample_notes(_self) -> int:
+        """Write sample notes once if client_notes is missing or empty; returns rows written"""
+        conn = _get_connection(_self.db_path)
+        
+        has_table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'client_notes'"
+        ).fetchone() is not None
+        if has_table and conn.execute("SELECT 1 FROM client_notes LIMIT 1").fetchone() is not None:
+            return 0
+        if not has_table:
+            _self.init_database()
+        
+        client_ids = pd.read_sql_query("SELECT client_id FROM clients LIMIT 50", conn)['client_id'].tolist()
+        sample_notes = _self.generate_sample_notes(client_ids)
+        _self._bulk_insert_notes(conn, sample_notes)
+        return len(sample_notes)
+    
+    @st.cache_data(ttl=300)
+    def load_note_options(_self, client_id: Optional[str] = None) -> Tuple[List[str], List[str]]:
+        """Distinct note types and priorities"""
+        conn = _get_connection(_self.db_path)
+        where_sql, params = ("WHERE client_id = ?", [client_id]) if client_id else ("", [])
+        note_types = [row[0] for row in conn.execute(
+            f"SELECT DISTINCT note_type FROM client_notes {where_sql} ORDER BY note_type", params)]
+        priorities = [row[0] for row in conn.execute(
+            f"SELECT DISTINCT priority FROM client_notes {where_sql} ORDER BY priority", params)]
+        return note_types, priorities
+    
+    @st.cache_data(ttl=300)
+    def load_notes(_self, client_id: Optional[str] = None, note_type: str = 'All', priority: str = 'All',
+                   date_range: Tuple = (), limit: int = 10) -> pd.DataFrame:
+        """Load the newest client notes matching the filters, filtered inside SQLite"""
+        where, params = [], []
+        if client_id:
+            where.append("client_id = ?")
+            params.append(client_id)
+        if note_type != 'All':
+            where.append("note_type = ?")
+            params.append(note_type)
+        if priority != 'All':
+            where.append("priority = ?")
+            params.append(priority)
+        if len(date_range) == 2:
+            # note_date is stored as ISO 'YYYY-MM-DD', so string bounds compare as dates
+            where.append("note_date BETWEEN ? AND ?")
+            params.extend(day.isoformat() for day in date_range)
+        
+        where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+        return pd.read_sql_query(
+            f"SELECT {', '.join(NOTE_COLUMNS)} FROM client_notes {where_sql} ORDER BY note_date DESC LIMIT ?",
+            _get_connection(_self.db_path), params=params + [limit]
+        )
     
     def generate_sample_notes(self, client_ids: List[str]) -> pd.DataFrame:
         """Generate sample client notes"""
         note_types = ["Meeting", "Call", "Email", "Review", "Alert", "Follow-up"]
         priorities = ["High", "Medium", "Low"]
         
-        notes_data = []
-        for client_id in client_ids[:50]:  # Generate notes for first 50 clients
-            num_notes = np.random.randint(1, 6)
-            for _ in range(num_notes):
-                note_date = datetime.now() - timedelta(days=np.random.randint(1, 365))
-                note_type = np.random.choice(note_types)
-                priority = np.random.choice(priorities)
-                
-                note_texts = {
-                    "Meeting": f"Client meeting scheduled for portfolio review. Discussed investment strategy and risk tolerance.",
-                    "Call": f"Follow-up call regarding recent market volatility. Client expressed satisfaction with performance.",
-                    "Email": f"Sent quarterly performance report. Client requested additional information on tax implications.",
-                    "Review": f"Annual portfolio review completed. Recommended rebalancing based on changed risk profile.",
-                    "Alert": f"Market alert: Significant movement in client's portfolio. Monitoring closely.",
-                    "Follow-up": f"Following up on previous recommendations. Client agreed to increase SIP amount."
-                }
-                
-                notes_data.append({
-                    'client_id': client_id,
-                    'note_date': note_date.strftime('%Y-%m-%d'),
-                    'note_text': note_texts[note_type],
-                    'note_type': note_type,
-                    'priority': priority,
-                    'created_by': f"RM_{np.random.randint(1, 5)}"
-                })
-        
-        return pd.DataFrame(notes_data)
+        note_texts = {
+            "Meeting": "Client meeting scheduled for portfolio review. Discussed investment strategy and risk tolerance.",
+            "Call": "Follow-up call regarding recent market volatility. Client expressed satisfaction with performance.",
+            "Email": "Sent quarterly performance report. Client requested additional information on tax implications.",
+            "Review": "Annual portfolio review completed. Recommended rebalancing based on changed risk profile.",
+            "Alert": "Market alert: Significant movement in client's portfolio. Monitoring closely.",
+            "Follow-up": "Following up on previous recommendations. Client agreed to increase SIP amount."
+        }
+        
+        # 1-5 notes for each of the first 50 clients, every column drawn in one call;
+        # seeded like the sample client book so a fresh database always gets the same notes
+        rng = np.random.default_rng(42)
+        clients = np.asarray(client_ids[:50], dtype=object)
+        counts = rng.integers(1, 6, size=len(clients))
+        total = int(counts.sum())
+        type_codes = rng.integers(0, len(note_types), size=total)
+        note_dates = pd.Timestamp.now().normalize() - pd.to_timedelta(rng.integers(1, 365, size=total), unit='D')
+        
+        return pd.DataFrame({
+            'client_id': np.repeat(clients, counts),
+            'note_date': note_dates.strftime('%Y-%m-%d'),
+            'note_text': np.array([note_texts[note_type] for note_type in note_types], dtype=object)[type_codes],
+            'note_type': np.array(note_types, dtype=object)[type_codes],
+            'priority': rng.choice(priorities, size=total),
+            'created_by': np.char.add('RM_', rng.integers(1, 5, size=total).astype(str))
+        })
+    
+    def _bulk_insert_notes(self, conn: sqlite3.Connection, notes: pd.DataFrame):
+        """Insert notes with one prepared statement inside a single transaction"""
+        rows = notes[NOTE_COLUMNS].itertuples(index=False, name=None)
+        with conn:
+            conn.executemany(INSERT_NOTE_SQL, rows)
     
-    def calculate_comprehensive_metrics(self, data: pd.DataFrame) -> Dict:
-        """Calculate comprehensive portfolio metrics"""
+    def add_notes(self, rows: Iterable[Tuple]):
+        """Insert note rows given in NOTE_COLUMNS order and invalidate the cached notes views"""
+        conn = _get_connection(self.db_path)
+        with conn:
+            conn.executemany(INSERT_NOTE_SQL, rows)
+        
+        # Drop the cached notes so the next run reads the new rows
+        self.load_notes.clear()
+        self.load_note_options.clear()
+    
+    @_cache_by_content
+    def calculate_comprehensive_metrics(_self, data: pd.DataFrame) -> Dict:
+        """Calculate comprehensive portfolio metrics, cached on the content of the (filtered) frame"""
         total_aum = data['current_aum'].sum()
         total_clients = len(data)
-        avg_returns = data['annualised_returns'].mean()
-        avg_benchmark = data['bse_500_benchmark_returns'].mean()
-        
+
+        # Return/benchmark moments in a single fused pass
+        returns = data['annualised_returns'].to_numpy(dtype=np.float64)
+        avg_returns, avg_benchmark, returns_std, benchmark_std, correlation, tracking_error = _fused_return_stats(
+            returns, data['bse_500_benchmark_returns'].to_numpy()
+        )
+
         # Advanced risk metrics
         alpha = avg_returns - avg_benchmark
-        returns_std = data['annualised_returns'].std()
         sharpe_ratio = (avg_returns - 6) / returns_std if returns_std > 0 else 0
-        
+
         # Beta calculation
-        correlation = np.corrcoef(data['annualised_returns'], data['bse_500_benchmark_returns'])[0, 1]
-        beta = correlation * (returns_std / data['bse_500_benchmark_returns'].std()) if data['bse_500_benchmark_returns'].std() > 0 else 1
-        
+        beta = correlation * (returns_std / benchmark_std) if benchmark_std > 0 else 1
+
         # Information ratio
-        tracking_error = (data['annualised_returns'] - data['bse_500_benchmark_returns']).std()
         information_ratio = alpha / tracking_error if tracking_error > 0 else 0
         
         # Sortino ratio (downside deviation)
-        downside_returns = data['annualised_returns'][data['annualised_returns'] < avg_returns]
-        downside_deviation = downside_returns.std() if len(downside_returns) > 0 else returns_std
+        downside_returns = returns[returns < avg_returns]
+        downside_deviation = downside_returns.std(ddof=1) if len(downside_returns) > 1 else returns_std
         sortino_ratio = (avg_returns - 6) / downside_deviation if downside_deviation > 0 else 0
         
         # Portfolio distributions
-        portfolio_composition = data['portfolio_type'].value_counts().to_dict()
-        risk_distribution = data['risk_profile'].value_counts().to_dict()
-        rm_distribution = data['rm_name'].value_counts().to_dict()
-        city_distribution = data['city'].value_counts().to_dict()
-        occupation_distribution = data['occupation'].value_counts().to_dict()
+        portfolio_composition = _observed_counts(data['portfolio_type'])
+        risk_distribution = _observed_counts(data['risk_profile'])
+        rm_distribution = _observed_counts(data['rm_name'])
+        city_distribution = _observed_counts(data['city'])
+        occupation_distribution = _observed_counts(data['occupation'])
         
         # Performance quartiles
         returns_quartiles = data['annualised_returns'].quantile([0.25, 0.5, 0.75]).to_dict()
         aum_quartiles = data['current_aum'].quantile([0.25, 0.5, 0.75]).to_dict()
         
         # Top performers
-        top_performers = data.nlargest(15, 'annualised_returns')[['client_name', 'annualised_returns', 'current_aum', 'portfolio_type', 'rm_name']]
-        bottom_performers = data.nsmallest(10, 'annualised_returns')[['client_name', 'annualised_returns', 'current_aum', 'portfolio_type', 'rm_name']]
-        
-        # AUM analysis
-        aum_ranges = {
-            '₹0.5-2 Cr': len(data[(data['current_aum'] >= 0.5) & (data['current_aum'] < 2)]),
-            '₹2-5 Cr': len(data[(data['current_aum'] >= 2) & (data['current_aum'] < 5)]),
-            '₹5-10 Cr': len(data[(data['current_aum'] >= 5) & (data['current_aum'] < 10)]),
-            '₹10-25 Cr': len(data[(data['current_aum'] >= 10) & (data['current_aum'] < 25)]),
-            '₹25-50 Cr': len(data[(data['current_aum'] >= 25) & (data['current_aum'] < 50)]),
-            '₹50-100 Cr': len(data[(data['current_aum'] >= 50) & (data['current_aum'] < 100)]),
-            '₹100-200 Cr': len(data[(data['current_aum'] >= 100) & (data['current_aum'] < 200)]),
-            '₹200+ Cr': len(data[data['current_aum'] >= 200])
-        }
-        
-        # Age demographics
-        age_ranges = {
-            '25-35': len(data[(data['age_of_client'] >= 25) & (data['age_of_client'] < 35)]),
-            '35-45': len(data[(data['age_of_client'] >= 35) & (data['age_of_client'] < 45)]),
-            '45-55': len(data[(data['age_of_client'] >= 45) & (data['age_of_client'] < 55)]),
-            '55-65': len(data[(data['age_of_client'] >= 55) & (data['age_of_client'] < 65)]),
-            '65+': len(data[data['age_of_client'] >= 65])
-        }
-        
-        # Tenure analysis
-        tenure_ranges = {
-            '< 1 Year': len(data[data['client_since'] < 1]),
-            '1-3 Years': len(data[(data['client_since'] >= 1) & (data['client_since'] < 3)]),
-            '3-5 Years': len(data[(data['client_since'] >= 3) & (data['client_since'] < 5)]),
-            '5-10 Years': len(data[(data['client_since'] >= 5) & (data['client_since'] < 10)]),
-            '10-15 Years': len(data[(data['client_since'] >= 10) & (data['client_since'] < 15)]),
-            '15+ Years': len(data[data['client_since'] >= 15])
-        }
-        
-        # Income analysis
-        income_ranges = {
-            '₹3-10 L': len(data[(data['annual_income'] >= 3) & (data['annual_income'] < 10)]),
-            '₹10-25 L': len(data[(data['annual_income'] >= 10) & (data['annual_income'] < 25)]),
-            '₹25-50 L': len(data[(data['annual_income'] >= 25) & (data['annual_income'] < 50)]),
-            '₹50-100 L': len(data[(data['annual_income'] >= 50) & (data['annual_income'] < 100)]),
-            '₹100+ L': len(data[data['annual_income'] >= 100])
-        }
+        performer_columns = ['client_name', 'annualised_returns', 'current_aum', 'portfolio_type', 'rm_name']
+        top_performers = data.iloc[_top_k_positions(returns, 15)][performer_columns]
+        bottom_performers = data.iloc[_top_k_positions(returns, 10, largest=False)][performer_columns]
+        
+        # AUM, age, tenure and income histograms in one binning pass
+        aum_ranges, age_ranges, tenure_ranges, income_ranges = [
+            dict(zip(labels, counts.tolist()))
+            for (_, _, labels), counts in zip(
+                BUCKET_SPECS,
+                _bucket_counts([data[column].to_numpy() for column, _, _ in BUCKET_SPECS],
+                               [edges for _, edges, _ in BUCKET_SPECS])
+            )
+        ]
         
         return {
             'total_aum': total_aum,
@@ -1164,35 +1057,34 @@ class AdvancedAnalyticsDashboard:
         """Create comprehensive client overview charts with multiple perspectives"""
         
         charts = {}
+        # Every view reads its aggregates from the same cached cube
+        cube = _build_cube(data)
         
         if view_type == "Performance Analysis":
-            # 1. Multi-dimensional Performance Scatter
-            fig_performance = go.Figure()
-            
-            # Create color mapping for portfolio types
-            portfolio_colors = px.colors.qualitative.Set3
-            portfolio_types = data['portfolio_type'].unique()
-            color_map = {pt: portfolio_colors[i % len(portfolio_colors)] for i, pt in enumerate(portfolio_types)}
-            
-            for portfolio_type in portfolio_types:
-                subset = data[data['portfolio_type'] == portfolio_type]
-                fig_performance.add_trace(go.Scatter(
-                    x=subset['current_aum'],
-                    y=subset['annualised_returns'],
-                    mode='markers',
-                    marker=dict(
-                        size=np.sqrt(subset['client_since']) * 4,
-                        color=color_map[portfolio_type],
-                        opacity=0.7,
-                        line=dict(width=1, color='white')
-                    ),
-                    text=[f"<b>{name}</b><br>AUM: ₹{aum:.2f} Cr<br>Returns: {ret:.2f}%<br>Tenure: {tenure:.1f} years<br>Age: {age}<br>RM: {rm}" 
-                          for name, aum, ret, tenure, age, rm in zip(subset['client_name'], subset['current_aum'], 
-                                                                    subset['annualised_returns'], subset['client_since'], 
-                                                                    subset['age_of_client'], subset['rm_name'])],
-                    hovertemplate='%{text}<extra></extra>',
-                    name=portfolio_type
-                ))
+            # 1. Multi-dimensional Performance Scatter, one WebGL call colour-split by portfolio type;
+            # large books ship a fixed sample of bubbles (the averages below still use every client)
+            points = data
+            if len(points) > BACKGROUND_POINT_LIMIT:
+                points = points.sample(BACKGROUND_SAMPLE_SIZE, random_state=0)
+            fig_performance = px.scatter(
+                points,
+                x='current_aum',
+                y='annualised_returns',
+                color='portfolio_type',
+                color_discrete_map=PORTFOLIO_COLOR_MAP,
+                color_discrete_sequence=px.colors.qualitative.Set3,
+                size=np.sqrt(points['client_since'].to_numpy()) * 4,
+                custom_data=['client_name', 'client_since', 'age_of_client', 'rm_name'],
+                labels={'portfolio_type': 'Portfolio Type'},
+                render_mode='webgl'
+            )
+            fig_performance.update_traces(
+                # Bubble diameters in pixels, as given, rather than px's area rescaling
+                marker=dict(sizemode='diameter', sizeref=1, opacity=0.7, line=dict(width=1, color='white')),
+                hovertemplate='<b>%{customdata[0]}</b><br>AUM: ₹%{x:.2f} Cr<br>Returns: %{y:.2f}%'
+                              '<br>Tenure: %{customdata[1]:.1f} years<br>Age: %{customdata[2]}'
+                              '<br>RM: %{customdata[3]}<extra></extra>'
+            )
             
             # Add benchmark and average lines
             fig_performance.add_hline(
@@ -1222,71 +1114,52 @@ class AdvancedAnalyticsDashboard:
             charts['performance'] = fig_performance
             
             # 2. Risk-Return Efficiency Frontier
-            portfolio_stats = data.groupby('portfolio_type').agg({
-                'annualised_returns': ['mean', 'std'],
-                'current_aum': 'sum',
-                'client_id': 'count'
-            }).round(2)
-            
-            portfolio_stats.columns = ['avg_return', 'risk', 'total_aum', 'client_count']
-            
-            fig_risk_return = go.Figure()
-            
-            fig_risk_return.add_trace(go.Scatter(
-                x=portfolio_stats['risk'],
-                y=portfolio_stats['avg_return'],
-                mode='markers+text',
-                marker=dict(
-                    size=portfolio_stats['client_count'] * 3,
-                    color=portfolio_stats['avg_return'],
-                    colorscale='RdYlGn',
-                    showscale=True,
-                    colorbar=dict(title="Avg Returns %"),
-                    line=dict(width=2, color='white')
-                ),
-                text=portfolio_stats.index,
-                textposition="middle center",
-                textfont=dict(size=10, color='white'),
-                hovertemplate='<b>%{text}</b><br>Risk: %{x:.2f}%<br>Return: %{y:.2f}%<br>Clients: ' + 
-                             portfolio_stats['client_count'].astype(str) + '<br>Total AUM: ₹' + 
-                             portfolio_stats['total_aum'].round(1).astype(str) + ' Cr<extra></extra>',
-                name='Portfolio Types'
-            ))
-            
-            # Add quadrant lines
-            avg_risk = portfolio_stats['risk'].mean()
-            avg_return = portfolio_stats['avg_return'].mean()
-            
-            fig_risk_return.add_vline(x=avg_risk, line_dash="dash", line_color="gray", opacity=0.5)
-            fig_risk_return.add_hline(y=avg_return, line_dash="dash", line_color="gray", opacity=0.5)
-            
-            # Add quadrant labels
-            fig_risk_return.add_annotation(x=avg_risk*0.5, y=avg_return*1.2, text="Low Risk<br>High Return", 
-                                         showarrow=False, font=dict(size=10, color="green"))
-            fig_risk_return.add_annotation(x=avg_risk*1.5, y=avg_return*1.2, text="High Risk<br>High Return", 
-                                         showarrow=False, font=dict(size=10, color="orange"))
-            fig_risk_return.add_annotation(x=avg_risk*0.5, y=avg_return*0.8, text="Low Risk<br>Low Return", 
-                                         showarrow=False, font=dict(size=10, color="blue"))
-            fig_risk_return.add_annotation(x=avg_risk*1.5, y=avg_return*0.8, text="High Risk<br>Low Return", 
-                                         showarrow=False, font=dict(size=10, color="red"))
-            
-            fig_risk_return.update_layout(
-                title="Risk-Return Efficiency Analysis (Bubble size = Client Count)",
-                xaxis_title="Risk (Standard Deviation %)",
-                yaxis_title="Average Returns (%)",
-                height=500,
-                template=self.chart_themes[theme]
+            portfolio_stats = cube['portfolio']
+            
+            # Quadrant lines through the average risk and return
+            avg_risk = float(np.nanmean(portfolio_stats['risk'].to_numpy()))
+            avg_return = float(np.nanmean(portfolio_stats['avg_return'].to_numpy()))
+            
+            fig_risk_return = _figure(
+                [dict(
+                    type='scatter',
+                    x=portfolio_stats['risk'].to_numpy(),
+                    y=portfolio_stats['avg_return'].to_numpy(),
+                    mode='markers+text',
+                    marker=dict(
+                        size=portfolio_stats['client_count'].to_numpy() * 3,
+                        color=portfolio_stats['avg_return'].to_numpy(),
+                        colorscale=px.colors.get_colorscale('RdYlGn'),
+                        showscale=True,
+                        colorbar=dict(title=dict(text="Avg Returns %")),
+                        line=dict(width=2, color='white')
+                    ),
+                    text=portfolio_stats.index.to_numpy(),
+                    textposition="middle center",
+                    textfont=dict(size=10, color='white'),
+                    customdata=np.column_stack([portfolio_stats['client_count'].to_numpy(), portfolio_stats['total_aum'].to_numpy()]),
+                    hovertemplate='<b>%{text}</b><br>Risk: %{x:.2f}%<br>Return: %{y:.2f}%<br>Clients: %{customdata[0]}'
+                                  '<br>Total AUM: ₹%{customdata[1]:.1f} Cr<extra></extra>',
+                    name='Portfolio Types'
+                )],
+                self.chart_themes[theme],
+                shapes=[_axis_line('x', avg_risk), _axis_line('y', avg_return)],
+                annotations=[
+                    dict(x=avg_risk * x_scale, y=avg_return * y_scale, text=text,
+                         showarrow=False, font=dict(size=10, color=color))
+                    for x_scale, y_scale, text, color in QUADRANT_LABELS
+                ],
+                title=dict(text="Risk-Return Efficiency Analysis (Bubble size = Client Count)"),
+                xaxis=dict(title=dict(text="Risk (Standard Deviation %)")),
+                yaxis=dict(title=dict(text="Average Returns (%)")),
+                height=500
             )
             
             charts['risk_return'] = fig_risk_return
             
         elif view_type == "Portfolio Composition":
             # 1. Hierarchical Sunburst Chart
-            portfolio_risk_data = data.groupby(['portfolio_type', 'risk_profile']).agg({
-                'current_aum': 'sum',
-                'client_id': 'count'
-            }).reset_index()
-            portfolio_risk_data.columns = ['portfolio_type', 'risk_profile', 'total_aum', 'client_count']
+            portfolio_risk_data = cube['portfolio_risk']
             
             fig_sunburst = px.sunburst(
                 portfolio_risk_data,
@@ -1317,65 +1190,55 @@ class AdvancedAnalyticsDashboard:
             
         elif view_type == "Geographic Analysis":
             # 1. City-wise Distribution
-            city_stats = data.groupby('city').agg({
-                'current_aum': 'sum',
-                'annualised_returns': 'mean',
-                'client_id': 'count'
-            }).round(2)
-            city_stats.columns = ['total_aum', 'avg_returns', 'client_count']
-            city_stats = city_stats.sort_values('total_aum', ascending=False)
-            
-            fig_city = go.Figure()
-            
-            fig_city.add_trace(go.Bar(
-                x=city_stats.index,
-                y=city_stats['total_aum'],
-                name='Total AUM (₹ Cr)',
-                marker_color='lightblue',
-                yaxis='y',
-                hovertemplate='<b>%{x}</b><br>Total AUM: ₹%{y:.1f} Cr<br>Clients: ' + 
-                             city_stats['client_count'].astype(str) + '<extra></extra>'
-            ))
-            
-            fig_city.add_trace(go.Scatter(
-                x=city_stats.index,
-                y=city_stats['avg_returns'],
-                mode='lines+markers',
-                name='Avg Returns (%)',
-                marker_color='red',
-                yaxis='y2',
-                hovertemplate='<b>%{x}</b><br>Avg Returns: %{y:.2f}%<extra></extra>'
-            ))
-            
-            fig_city.update_layout(
-                title="City-wise AUM and Performance Analysis",
-                xaxis_title="City",
-                yaxis=dict(title="Total AUM (₹ Crores)", side="left"),
-                yaxis2=dict(title="Average Returns (%)", side="right", overlaying="y"),
+            city_stats = cube['city']
+            
+            cities = city_stats.index.to_numpy()
+            
+            fig_city = _figure(
+                [
+                    dict(
+                        type='bar',
+                        x=cities,
+                        y=city_stats['total_aum'].to_numpy(),
+                        name='Total AUM (₹ Cr)',
+                        marker=dict(color='lightblue'),
+                        yaxis='y',
+                        customdata=city_stats['client_count'].to_numpy(),
+                        hovertemplate='<b>%{x}</b><br>Total AUM: ₹%{y:.1f} Cr<br>Clients: %{customdata}<extra></extra>'
+                    ),
+                    dict(
+                        type='scatter',
+                        x=cities,
+                        y=city_stats['avg_returns'].to_numpy(),
+                        mode='lines+markers',
+                        name='Avg Returns (%)',
+                        marker=dict(color='red'),
+                        yaxis='y2',
+                        hovertemplate='<b>%{x}</b><br>Avg Returns: %{y:.2f}%<extra></extra>'
+                    )
+                ],
+                self.chart_themes[theme],
+                title=dict(text="City-wise AUM and Performance Analysis"),
+                xaxis=dict(title=dict(text="City")),
+                yaxis=dict(title=dict(text="Total AUM (₹ Crores)"), side="left"),
+                yaxis2=dict(title=dict(text="Average Returns (%)"), side="right", overlaying="y"),
                 height=500,
-                template=self.chart_themes[theme],
                 legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
             )
             
             charts['city_analysis'] = fig_city
             
             # 2. Occupation-wise Analysis
-            occupation_stats = data.groupby('occupation').agg({
-                'current_aum': ['sum', 'mean'],
-                'annualised_returns': 'mean',
-                'annual_income': 'mean',
-                'client_id': 'count'
-            }).round(2)
-            
-            occupation_stats.columns = ['total_aum', 'avg_aum', 'avg_returns', 'avg_income', 'client_count']
+            occupation_stats = cube['occupation']
             
             fig_occupation = px.scatter(
-                occupation_stats.reset_index(),
+                occupation_stats,
                 x='avg_income',
                 y='avg_returns',
                 size='client_count',
                 color='total_aum',
                 hover_name='occupation',
+                hover_data={'avg_income': ':.2f', 'avg_returns': ':.2f', 'total_aum': ':.2f'},
                 title="Occupation Analysis (Income vs Returns)",
                 labels={'avg_income': 'Average Income (₹ Lakhs)', 'avg_returns': 'Average Returns (%)'},
                 color_continuous_scale='Plasma',
@@ -1386,19 +1249,44 @@ class AdvancedAnalyticsDashboard:
             charts['occupation_analysis'] = fig_occupation
             
         elif view_type == "Demographic Analysis":
-            # 1. Age vs Performance Analysis
-            fig_age_performance = px.scatter(
-                data,
-                x='age_of_client',
-                y='annualised_returns',
-                color='risk_profile',
-                size='current_aum',
-                hover_data=['client_name', 'portfolio_type', 'rm_name'],
-                title="Age vs Performance Analysis (Bubble size = AUM)",
-                labels={'age_of_client': 'Client Age', 'annualised_returns': 'Annualised Returns (%)'},
+            # 1. Age vs Performance Analysis: one WebGL trace per risk profile, rows picked by factorized code
+            codes, risk_profiles = pd.factorize(data['risk_profile'])
+            ages = data['age_of_client'].to_numpy()
+            returns = data['annualised_returns'].to_numpy()
+            aum = data['current_aum'].to_numpy()
+            details = np.column_stack([
+                data['client_name'].to_numpy(dtype=object),
+                data['portfolio_type'].to_numpy(dtype=object),
+                data['rm_name'].to_numpy(dtype=object)
+            ])
+            # Bubble areas scaled like px.scatter's size= (largest AUM drawn at 20px); filters may leave no rows
+            sizeref = 2.0 * max(float(np.max(aum, initial=0.0)), 1e-9) / 20 ** 2
+            
+            traces = []
+            for code, risk_profile in enumerate(risk_profiles):
+                rows = codes == code
+                traces.append(dict(
+                    type='scattergl',
+                    mode='markers',
+                    name=risk_profile,
+                    x=ages[rows],
+                    y=returns[rows],
+                    marker=dict(size=aum[rows], sizemode='area', sizeref=sizeref),
+                    customdata=details[rows],
+                    hovertemplate='<b>%{customdata[0]}</b><br>Client Age: %{x}<br>Annualised Returns: %{y:.2f}%'
+                                  '<br>AUM: ₹%{marker.size:.2f} Cr<br>Portfolio: %{customdata[1]}'
+                                  '<br>RM: %{customdata[2]}<extra>%{fullData.name}</extra>'
+                ))
+            
+            fig_age_performance = _figure(
+                traces,
+                self.chart_themes[theme],
+                title=dict(text="Age vs Performance Analysis (Bubble size = AUM)"),
+                xaxis=dict(title=dict(text="Client Age")),
+                yaxis=dict(title=dict(text="Annualised Returns (%)")),
+                legend=dict(title=dict(text="risk_profile")),
                 height=500
             )
-            fig_age_performance.update_layout(template=self.chart_themes[theme])
             
             charts['age_performance'] = fig_age_performance
             
@@ -1418,15 +1306,7 @@ class AdvancedAnalyticsDashboard:
             
         elif view_type == "RM Performance":
             # 1. RM Performance Heatmap
-            rm_performance = data.groupby(['rm_name', 'portfolio_type']).agg({
-                'annualised_returns': 'mean',
-                'current_aum': 'sum',
-                'client_id': 'count'
-            }).round(2)
-            
-            # Pivot for heatmap
-            rm_returns_pivot = rm_performance['annualised_returns'].unstack(fill_value=0)
-            rm_aum_pivot = rm_performance['current_aum'].unstack(fill_value=0)
+            rm_returns_pivot = cube['rm_returns']
             
             fig_rm_heatmap = px.imshow(
                 rm_returns_pivot.values,
@@ -1437,46 +1317,41 @@ class AdvancedAnalyticsDashboard:
                 labels=dict(x="Portfolio Type", y="Relationship Manager", color="Avg Returns %"),
                 height=400
             )
+            fig_rm_heatmap.update_traces(
+                hovertemplate='Portfolio Type: %{x}<br>Relationship Manager: %{y}<br>Avg Returns: %{z:.2f}%<extra></extra>'
+            )
             fig_rm_heatmap.update_layout(template=self.chart_themes[theme])
             
             charts['rm_heatmap'] = fig_rm_heatmap
             
             # 2. RM Efficiency Analysis
-            rm_stats = data.groupby('rm_name').agg({
-                'current_aum': ['sum', 'mean'],
-                'annualised_returns': 'mean',
-                'client_id': 'count'
-            }).round(2)
-            
-            rm_stats.columns = ['total_aum', 'avg_aum_per_client', 'avg_returns', 'client_count']
-            
-            fig_rm_efficiency = go.Figure()
-            
-            fig_rm_efficiency.add_trace(go.Scatter(
-                x=rm_stats['client_count'],
-                y=rm_stats['avg_returns'],
-                mode='markers+text',
-                marker=dict(
-                    size=rm_stats['total_aum'] / 10,  # Scale down for visibility
-                    color=rm_stats['avg_aum_per_client'],
-                    colorscale='Viridis',
-                    showscale=True,
-                    colorbar=dict(title="Avg AUM per Client"),
-                    line=dict(width=2, color='white')
-                ),
-                text=rm_stats.index,
-                textposition="top center",
-                hovertemplate='<b>%{text}</b><br>Clients: %{x}<br>Avg Returns: %{y:.2f}%<br>Total AUM: ₹' + 
-                             rm_stats['total_aum'].round(1).astype(str) + ' Cr<extra></extra>',
-                name='RM Performance'
-            ))
-            
-            fig_rm_efficiency.update_layout(
-                title="RM Efficiency Analysis (Bubble size = Total AUM)",
-                xaxis_title="Number of Clients",
-                yaxis_title="Average Returns (%)",
-                height=500,
-                template=self.chart_themes[theme]
+            rm_stats = cube['rm']
+            
+            fig_rm_efficiency = _figure(
+                [dict(
+                    type='scatter',
+                    x=rm_stats['client_count'].to_numpy(),
+                    y=rm_stats['avg_returns'].to_numpy(),
+                    mode='markers+text',
+                    marker=dict(
+                        size=rm_stats['total_aum'].to_numpy() / 10,  # Scale down for visibility
+                        color=rm_stats['avg_aum_per_client'].to_numpy(),
+                        colorscale=px.colors.get_colorscale('Viridis'),
+                        showscale=True,
+                        colorbar=dict(title=dict(text="Avg AUM per Client")),
+                        line=dict(width=2, color='white')
+                    ),
+                    text=rm_stats.index.to_numpy(),
+                    textposition="top center",
+                    customdata=rm_stats['total_aum'].to_numpy(),
+                    hovertemplate='<b>%{text}</b><br>Clients: %{x}<br>Avg Returns: %{y:.2f}%<br>Total AUM: ₹%{customdata:.1f} Cr<extra></extra>',
+                    name='RM Performance'
+                )],
+                self.chart_themes[theme],
+                title=dict(text="RM Efficiency Analysis (Bubble size = Total AUM)"),
+                xaxis=dict(title=dict(text="Number of Clients")),
+                yaxis=dict(title=dict(text="Average Returns (%)")),
+                height=500
             )
             
             charts['rm_efficiency'] = fig_rm_efficiency
@@ -1490,21 +1365,18 @@ class AdvancedAnalyticsDashboard:
         
         if view_type == "Transaction Trends":
             # 1. Monthly Flow Trends
-            flows_data['transaction_date'] = pd.to_datetime(flows_data['transaction_date'])
-            flows_data['month_year'] = flows_data['transaction_date'].dt.to_period('M')
-            
-            monthly_flows = flows_data.groupby(['month_year', 'transaction_label']).agg({
-                'amount': 'sum'
-            }).reset_index()
-            monthly_flows['month_year_str'] = monthly_flows['month_year'].astype(str)
+            # month_start is precomputed at load, so binning is a plain datetime64 groupby
+            monthly_flows = flows_data.groupby(
+                ['month_start', 'transaction_label'], observed=True, as_index=False
+            )['amount'].sum()
             
             fig_monthly_trends = px.line(
                 monthly_flows,
-                x='month_year_str',
+                x='month_start',
                 y='amount',
                 color='transaction_label',
                 title="Monthly Transaction Trends by Type",
-                labels={'month_year_str': 'Month', 'amount': 'Amount (₹ Crores)'},
+                labels={'month_start': 'Month', 'amount': 'Amount (₹ Crores)'},
                 height=500
             )
             fig_monthly_trends.update_layout(template=self.chart_themes[theme])
@@ -1512,78 +1384,70 @@ class AdvancedAnalyticsDashboard:
             charts['monthly_trends'] = fig_monthly_trends
             
             # 2. Transaction Volume Analysis
-            transaction_summary = flows_data.groupby('transaction_label').agg({
-                'amount': ['sum', 'mean', 'count'],
+            transaction_summary = flows_data.groupby('transaction_label', observed=True).agg({
+                'amount': ['sum', 'mean', 'size'],
                 'client_id': 'nunique'
-            }).round(2)
+            })
             
             transaction_summary.columns = ['total_amount', 'avg_amount', 'transaction_count', 'unique_clients']
             
-            fig_volume = go.Figure()
-            
-            fig_volume.add_trace(go.Bar(
-                x=transaction_summary.index,
-                y=transaction_summary['total_amount'],
-                name='Total Amount',
-                marker_color='lightblue',
-                yaxis='y'
-            ))
-            
-            fig_volume.add_trace(go.Scatter(
-                x=transaction_summary.index,
-                y=transaction_summary['transaction_count'],
-                mode='lines+markers',
-                name='Transaction Count',
-                marker_color='red',
-                yaxis='y2'
-            ))
-            
-            fig_volume.update_layout(
-                title="Transaction Volume Analysis",
-                xaxis_title="Transaction Type",
-                yaxis=dict(title="Total Amount (₹ Crores)", side="left"),
-                yaxis2=dict(title="Transaction Count", side="right", overlaying="y"),
-                height=500,
-                template=self.chart_themes[theme]
+            transaction_labels = transaction_summary.index.to_numpy()
+            
+            fig_volume = _figure(
+                [
+                    dict(
+                        type='bar',
+                        x=transaction_labels,
+                        y=transaction_summary['total_amount'].to_numpy(),
+                        name='Total Amount',
+                        marker=dict(color='lightblue'),
+                        yaxis='y'
+                    ),
+                    dict(
+                        type='scatter',
+                        x=transaction_labels,
+                        y=transaction_summary['transaction_count'].to_numpy(),
+                        mode='lines+markers',
+                        name='Transaction Count',
+                        marker=dict(color='red'),
+                        yaxis='y2'
+                    )
+                ],
+                self.chart_themes[theme],
+                title=dict(text="Transaction Volume Analysis"),
+                xaxis=dict(title=dict(text="Transaction Type")),
+                yaxis=dict(title=dict(text="Total Amount (₹ Crores)"), side="left", hoverformat=".2f"),
+                yaxis2=dict(title=dict(text="Transaction Count"), side="right", overlaying="y"),
+                height=500
             )
             
             charts['volume_analysis'] = fig_volume
             
         elif view_type == "Client Flow Patterns":
             # 1. Client-wise Flow Analysis
-            client_flows = flows_data.groupby(['client_id', 'transaction_label']).agg({
-                'amount': 'sum'
-            }).reset_index()
+            # transaction_label is categorical, so map classifies each category once;
+            # the client x direction sums are then one dense bincount table
+            directions = flows_data['transaction_label'].map(_flow_direction)
             
-            # Pivot to get inflows vs outflows
-            client_pivot = client_flows.pivot(index='client_id', columns='transaction_label', values='amount').fillna(0)
+            client_pivot = group_matrix(
+                flows_data['client_id'], directions.rename('direction'), flows_data['amount'], how='sum'
+            ).reindex(columns=['inflow', 'outflow'], fill_value=0)
+            client_pivot.columns = ['total_inflows', 'total_outflows']
             
             # Calculate net flows
-            inflow_cols = [col for col in client_pivot.columns if any(term in col.lower() for term in ['investment', 'deposit', 'addition'])]
-            outflow_cols = [col for col in client_pivot.columns if any(term in col.lower() for term in ['withdrawal', 'redemption', 'fees'])]
-            
-            if inflow_cols:
-                client_pivot['total_inflows'] = client_pivot[inflow_cols].sum(axis=1)
-            else:
-                client_pivot['total_inflows'] = 0
-                
-            if outflow_cols:
-                client_pivot['total_outflows'] = client_pivot[outflow_cols].sum(axis=1)
-            else:
-                client_pivot['total_outflows'] = 0
-            
             client_pivot['net_flows'] = client_pivot['total_inflows'] - client_pivot['total_outflows']
             
             fig_client_flows = px.scatter(
-                client_pivot.reset_index(),
+                client_pivot,
                 x='total_inflows',
                 y='total_outflows',
                 color='net_flows',
-                hover_data=['client_id'],
+                hover_data={'client_id': client_pivot.index},
                 title="Client Flow Patterns (Inflows vs Outflows)",
                 labels={'total_inflows': 'Total Inflows (₹ Crores)', 'total_outflows': 'Total Outflows (₹ Crores)'},
                 color_continuous_scale='RdYlGn',
-                height=500
+                height=500,
+                render_mode='webgl'
             )
             fig_client_flows.update_layout(template=self.chart_themes[theme])
             
@@ -1591,12 +1455,9 @@ class AdvancedAnalyticsDashboard:
             
         elif view_type == "Seasonal Analysis":
             # 1. Seasonal Patterns
-            flows_data['month'] = flows_data['transaction_date'].dt.month
-            flows_data['quarter'] = flows_data['transaction_date'].dt.quarter
-            
-            seasonal_flows = flows_data.groupby(['quarter', 'transaction_label']).agg({
-                'amount': 'sum'
-            }).reset_index()
+            seasonal_flows = flows_data.groupby(
+                ['quarter', 'transaction_label'], observed=True, as_index=False
+            )['amount'].sum()
             
             fig_seasonal = px.bar(
                 seasonal_flows,
@@ -1619,35 +1480,30 @@ class AdvancedAnalyticsDashboard:
         if not selected_clients:
             return {}
         
-        # Filter data for selected clients
-        client_data = data[data['client_id'].isin(selected_clients)]
+        # One indexed lookup for all selected clients, in selection order
+        client_rows = data.set_index('client_id', drop=False).loc[selected_clients]
         
         charts = {}
         
-        # 1. Client Performance Comparison
-        fig_performance = go.Figure()
-        
         colors = px.colors.qualitative.Set3
+        client_labels = (client_rows['client_name'] + ' (' + client_rows['client_id'] + ')').to_numpy()
+        returns = client_rows['annualised_returns'].to_numpy(dtype=float)
+        benchmark = client_rows['bse_500_benchmark_returns'].to_numpy(dtype=float)
         
-        for i, client_id in enumerate(selected_clients):
-            client_info = client_data[client_data['client_id'] == client_id].iloc[0]
-            
-            fig_performance.add_trace(go.Bar(
-                name=f"{client_info['client_name']} ({client_id})",
-                x=['Returns', 'Benchmark', 'Alpha'],
-                y=[
-                    client_info['annualised_returns'],
-                    client_info['bse_500_benchmark_returns'],
-                    client_info['annualised_returns'] - client_info['bse_500_benchmark_returns']
-                ],
-                marker_color=colors[i % len(colors)],
-                text=[
-                    f"{client_info['annualised_returns']:.2f}%",
-                    f"{client_info['bse_500_benchmark_returns']:.2f}%",
-                    f"{client_info['annualised_returns'] - client_info['bse_500_benchmark_returns']:.2f}%"
-                ],
-                textposition='auto'
-            ))
+        # 1. Client Performance Comparison
+        performance = _client_metric_frame(
+            client_labels, ['Returns', 'Benchmark', 'Alpha'],
+            np.column_stack([returns, benchmark, returns - benchmark])
+        )
+        fig_performance = px.bar(
+            performance,
+            x='metric',
+            y='value',
+            color='client',
+            barmode='group',
+            color_discrete_sequence=colors
+        )
+        fig_performance.update_traces(texttemplate='%{y:.2f}%', textposition='auto')
         
         fig_performance.update_layout(
             title="Client Performance Comparison",
@@ -1655,35 +1511,30 @@ class AdvancedAnalyticsDashboard:
             yaxis_title="Returns (%)",
             height=500,
             template=self.chart_themes[theme],
-            barmode='group'
+            legend_title_text=None
         )
         
         charts['performance_comparison'] = fig_performance
         
         # 2. AUM and Portfolio Composition
-        fig_aum = go.Figure()
-        
-        for i, client_id in enumerate(selected_clients):
-            client_info = client_data[client_data['client_id'] == client_id].iloc[0]
-            
-            fig_aum.add_trace(go.Bar(
-                name=f"{client_info['client_name']}",
-                x=['Current AUM', 'Initial Corpus', 'Additions', 'Withdrawals'],
-                y=[
-                    client_info['current_aum'],
-                    client_info['initial_corpus'],
-                    client_info['additions'],
-                    abs(client_info['withdrawals'])
-                ],
-                marker_color=colors[i % len(colors)],
-                text=[
-                    f"₹{client_info['current_aum']:.2f} Cr",
-                    f"₹{client_info['initial_corpus']:.2f} Cr",
-                    f"₹{client_info['additions']:.2f} Cr",
-                    f"₹{abs(client_info['withdrawals']):.2f} Cr"
-                ],
-                textposition='auto'
-            ))
+        composition = _client_metric_frame(
+            client_labels, ['Current AUM', 'Initial Corpus', 'Additions', 'Withdrawals'],
+            np.column_stack([
+                client_rows['current_aum'].to_numpy(dtype=float),
+                client_rows['initial_corpus'].to_numpy(dtype=float),
+                client_rows['additions'].to_numpy(dtype=float),
+                np.abs(client_rows['withdrawals'].to_numpy(dtype=float))
+            ])
+        )
+        fig_aum = px.bar(
+            composition,
+            x='metric',
+            y='value',
+            color='client',
+            barmode='group',
+            color_discrete_sequence=colors
+        )
+        fig_aum.update_traces(texttemplate='₹%{y:.2f} Cr', textposition='auto')
         
         fig_aum.update_layout(
             title="AUM and Investment Flow Comparison",
@@ -1691,7 +1542,7 @@ class AdvancedAnalyticsDashboard:
             yaxis_title="Amount (₹ Crores)",
             height=500,
             template=self.chart_themes[theme],
-            barmode='group'
+            legend_title_text=None
         )
         
         charts['aum_comparison'] = fig_aum
@@ -1699,10 +1550,14 @@ class AdvancedAnalyticsDashboard:
         # 3. Risk-Return Scatter for Selected Clients
         fig_risk_return = go.Figure()
         
-        # Add all clients as background
-        fig_risk_return.add_trace(go.Scatter(
-            x=data['annualised_returns'],
-            y=data['current_aum'],
+        # Add all clients as background, thinned to a fixed sample on large books
+        background = data
+        if len(background) > BACKGROUND_POINT_LIMIT:
+            background = background.sample(BACKGROUND_SAMPLE_SIZE, random_state=0)
+        
+        fig_risk_return.add_trace(go.Scattergl(
+            x=background['annualised_returns'],
+            y=background['current_aum'],
             mode='markers',
             marker=dict(
                 size=8,
@@ -1711,12 +1566,12 @@ class AdvancedAnalyticsDashboard:
             ),
             name='All Clients',
             hovertemplate='<b>%{text}</b><br>Returns: %{x:.2f}%<br>AUM: ₹%{y:.2f} Cr<extra></extra>',
-            text=data['client_name']
+            text=background['client_name']
         ))
         
         # Highlight selected clients
         for i, client_id in enumerate(selected_clients):
-            client_info = client_data[client_data['client_id'] == client_id].iloc[0]
+            client_info = client_rows.loc[client_id]
             
             fig_risk_return.add_trace(go.Scatter(
                 x=[client_info['annualised_returns']],
@@ -1730,7 +1585,8 @@ class AdvancedAnalyticsDashboard:
                 text=[client_info['client_name']],
                 textposition="top center",
                 name=f"{client_info['client_name']}",
-                hovertemplate=f'<b>{client_info["client_name"]}</b><br>Returns: {client_info["annualised_returns"]:.2f}%<br>AUM: ₹{client_info["current_aum"]:.2f} Cr<br>Portfolio: {client_info["portfolio_type"]}<br>Risk: {client_info["risk_profile"]}<extra></extra>'
+                customdata=[[client_info['portfolio_type'], client_info['risk_profile']]],
+                hovertemplate='<b>%{text}</b><br>Returns: %{x:.2f}%<br>AUM: ₹%{y:.2f} Cr<br>Portfolio: %{customdata[0]}<br>Risk: %{customdata[1]}<extra></extra>'
             ))
         
         fig_risk_return.update_layout(
@@ -1756,22 +1612,16 @@ class AdvancedAnalyticsDashboard:
         
         with col1:
             # Create client options with names and IDs
-            client_options = []
-            for _, row in data.iterrows():
-                client_options.append(f"{row['client_name']} ({row['client_id']})")
+            client_labels = _client_labels(data)
             
-            selected_client_options = st.multiselect(
+            # Options are the client IDs themselves; only their display is formatted
+            selected_clients = st.multiselect(
                 "Select Clients for Analysis (up to 5 recommended)",
-                client_options,
+                list(client_labels),
+                format_func=client_labels.get,
                 max_selections=5,
                 help="Choose clients to analyze and compare their performance"
             )
-            
-            # Extract client IDs from selections
-            selected_clients = []
-            for option in selected_client_options:
-                client_id = option.split('(')[-1].replace(')', '')
-                selected_clients.append(client_id)
         
         with col2:
             analysis_theme = st.selectbox(
@@ -1789,41 +1639,35 @@ class AdvancedAnalyticsDashboard:
             sample_clients = data.head(6)
             cols = st.columns(3)
             
-            for i, (_, client) in enumerate(sample_clients.iterrows()):
+            for i, client in enumerate(sample_clients.itertuples(index=False)):
                 with cols[i % 3]:
                     st.markdown(f"""
                     <div class="note-card">
-                        <strong>{client['client_name']}</strong><br>
-                        <small>ID: {client['client_id']}</small><br>
-                        AUM: ₹{client['current_aum']:.2f} Cr<br>
-                        Returns: {client['annualised_returns']:.2f}%<br>
-                        Type: {client['portfolio_type']}<br>
-                        RM: {client['rm_name']}
+                        <strong>{client.client_name}</strong><br>
+                        <small>ID: {client.client_id}</small><br>
+                        AUM: ₹{client.current_aum:.2f} Cr<br>
+                        Returns: {client.annualised_returns:.2f}%<br>
+                        Type: {client.portfolio_type}<br>
+                        RM: {client.rm_name}
                     </div>
                     """, unsafe_allow_html=True)
             
             return
         
         # Filter data for selected clients
-        selected_data = data[data['client_id'].isin(selected_clients)]
+        selected_data = data.set_index('client_id', drop=False).loc[selected_clients].reset_index(drop=True)
         
         # Display selected client summary
         st.markdown("### 📊 Selected Clients Summary")
         
-        cols = st.columns(len(selected_clients))
-        for i, (_, client) in enumerate(selected_data.iterrows()):
-            with cols[i]:
-                performance_color = "green" if client['annualised_returns'] > client['bse_500_benchmark_returns'] else "red"
-                st.markdown(f"""
-                <div class="metric-card" style="background: linear-gradient(135deg, {'#10b981' if performance_color == 'green' else '#ef4444'}, {'#059669' if performance_color == 'green' else '#dc2626'});">
-                    <div class="metric-value">{client['client_name']}</div>
-                    <div class="metric-label">{client['client_id']}</div>
-                    <hr style="margin: 0.5rem 0; border-color: rgba(255,255,255,0.3);">
-                    <div style="font-size: 1.2rem; font-weight: bold;">₹{client['current_aum']:.2f} Cr</div>
-                    <div style="font-size: 1rem;">{client['annualised_returns']:.2f}% Returns</div>
-                    <div style="font-size: 0.9rem; opacity: 0.8;">{client['portfolio_type']} | {client['risk_profile']}</div>
-                </div>
-                """, unsafe_allow_html=True)
+        st.markdown('<div class="metric-row">' + ''.join(
+            CLIENT_CARD_HTML.format(
+                client=client,
+                colors=('#10b981', '#059669') if client.annualised_returns > client.bse_500_benchmark_returns
+                else ('#ef4444', '#dc2626')
+            )
+            for client in selected_data.itertuples(index=False)
+        ) + '</div>', unsafe_allow_html=True)
         
         # Create and display individual client charts
         charts = self.create_individual_client_analysis(data, selected_clients, analysis_theme)
@@ -1850,11 +1694,11 @@ class AdvancedAnalyticsDashboard:
         
         # Format for display
         display_comparison = comparison_data.copy()
-        display_comparison['current_aum'] = display_comparison['current_aum'].apply(lambda x: f"₹{x:.2f} Cr")
-        display_comparison['annualised_returns'] = display_comparison['annualised_returns'].apply(lambda x: f"{x:.2f}%")
-        display_comparison['bse_500_benchmark_returns'] = display_comparison['bse_500_benchmark_returns'].apply(lambda x: f"{x:.2f}%")
-        display_comparison['alpha'] = display_comparison['alpha'].apply(lambda x: f"{x:.2f}%")
-        display_comparison['client_since'] = display_comparison['client_since'].apply(lambda x: f"{x:.1f} years")
+        display_comparison['current_aum'] = _format_values(display_comparison['current_aum'], '₹%.2f Cr')
+        display_comparison['annualised_returns'] = _format_values(display_comparison['annualised_returns'], '%.2f%%')
+        display_comparison['bse_500_benchmark_returns'] = _format_values(display_comparison['bse_500_benchmark_returns'], '%.2f%%')
+        display_comparison['alpha'] = _format_values(display_comparison['alpha'], '%.2f%%')
+        display_comparison['client_since'] = _format_values(display_comparison['client_since'], '%.1f years')
         
         # Rename columns
         display_comparison.columns = [
@@ -1866,7 +1710,7 @@ class AdvancedAnalyticsDashboard:
         st.dataframe(display_comparison, use_container_width=True)
         
         # Individual client flows if available
-        flows_data = self.flows_tracker.load_flows_data()
+        flows_data = self.load_flows()
         if len(flows_data) > 0:
             client_flows = flows_data[flows_data['client_id'].isin(selected_clients)]
             
@@ -1874,9 +1718,9 @@ class AdvancedAnalyticsDashboard:
                 st.markdown("### 💰 Transaction History for Selected Clients")
                 
                 # Flow summary by client
-                flow_summary = client_flows.groupby(['client_id', 'transaction_label']).agg({
-                    'amount': 'sum'
-                }).reset_index()
+                flow_summary = client_flows.groupby(
+                    ['client_id', 'transaction_label'], observed=True, as_index=False
+                )['amount'].sum()
                 
                 fig_flows = px.bar(
                     flow_summary,
@@ -1901,8 +1745,8 @@ class AdvancedAnalyticsDashboard:
         
         # Export selected client data
         if st.button("📥 Export Selected Client Analysis"):
-            export_data = selected_data.copy()
-            csv = export_data.to_csv(index=False)
+            # load_data projects only the columns the views use; the export carries every stored column
+            csv = _to_csv_bytes(self.load_client_rows(selected_clients))
             st.download_button(
                 label="Download Selected Clients CSV",
                 data=csv,
@@ -1910,38 +1754,21 @@ class AdvancedAnalyticsDashboard:
                 mime="text/csv"
             )
     
+    @st.fragment
     def render_client_notes_section(self, client_id: str = None):
-        """Render client notes management section"""
+        """Render client notes management section; its filters and inserts rerun only this fragment"""
         st.markdown("### 📝 Client Notes Management")
         
-        # Generate sample notes if not exists
-        conn = sqlite3.connect(self.db_path)
-        
-        try:
-            notes_data = pd.read_sql_query("SELECT * FROM client_notes ORDER BY note_date DESC", conn)
-            if len(notes_data) == 0:
-                raise ValueError("No notes found")
-        except:
-            # Generate sample notes
-            client_ids = pd.read_sql_query("SELECT client_id FROM clients LIMIT 50", conn)['client_id'].tolist()
-            sample_notes = self.generate_sample_notes(client_ids)
-            sample_notes.to_sql('client_notes', conn, if_exists='replace', index=False)
-            notes_data = sample_notes
-        
-        conn.close()
-        
-        # Filter by client if specified
-        if client_id:
-            notes_data = notes_data[notes_data['client_id'] == client_id]
+        note_types, priorities = self.load_note_options(client_id)
         
         # Notes filters
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            note_type_filter = st.selectbox("Note Type", ['All'] + list(notes_data['note_type'].unique()))
+            note_type_filter = st.selectbox("Note Type", ['All'] + note_types)
         
         with col2:
-            priority_filter = st.selectbox("Priority", ['All'] + list(notes_data['priority'].unique()))
+            priority_filter = st.selectbox("Priority", ['All'] + priorities)
         
         with col3:
             date_range = st.date_input(
@@ -1950,43 +1777,11 @@ class AdvancedAnalyticsDashboard:
                 max_value=datetime.now()
             )
         
-        # Apply filters
-        filtered_notes = notes_data.copy()
+        # Filled after the add-note form runs, so a note added this run is already listed
+        notes_list = st.container()
         
-        if note_type_filter != 'All':
-            filtered_notes = filtered_notes[filtered_notes['note_type'] == note_type_filter]
-        
-        if priority_filter != 'All':
-            filtered_notes = filtered_notes[filtered_notes['priority'] == priority_filter]
-        
-        if len(date_range) == 2:
-            start_date, end_date = date_range
-            filtered_notes = filtered_notes[
-                (pd.to_datetime(filtered_notes['note_date']).dt.date >= start_date) &
-                (pd.to_datetime(filtered_notes['note_date']).dt.date <= end_date)
-            ]
-        
-        # Display notes
-        if len(filtered_notes) > 0:
-            for _, note in filtered_notes.head(10).iterrows():
-                priority_class = f"note-priority-{note['priority'].lower()}"
-                st.markdown(f"""
-                <div class="note-card {priority_class}">
-                    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;">
-                        <strong>{note['client_id']} - {note['note_type']}</strong>
-                        <span style="font-size: 0.9rem; opacity: 0.8;">{note['note_date']} | {note['priority']} Priority</span>
-                    </div>
-                    <p style="margin: 0;">{note['note_text']}</p>
-                    <div style="margin-top: 0.5rem; font-size: 0.8rem; opacity: 0.7;">
-                        Created by: {note['created_by']}
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-        else:
-            st.info("No notes found for the selected criteria.")
-        
-        # Add new note section
-        with st.expander("➕ Add New Note"):
+        # Add new note section; the form holds widget edits until submit instead of rerunning per field
+        with st.expander("➕ Add New Note"), st.form("add_note_form"):
             col1, col2 = st.columns(2)
             
             with col1:
@@ -1999,35 +1794,45 @@ class AdvancedAnalyticsDashboard:
             
             new_note_text = st.text_area("Note Text")
             
-            if st.button("Add Note"):
+            if st.form_submit_button("Add Note"):
                 if new_client_id and new_note_text:
                     # Add note to database
-                    conn = sqlite3.connect(self.db_path)
-                    cursor = conn.cursor()
-                    
-                    cursor.execute('''
-                        INSERT INTO client_notes (client_id, note_date, note_text, note_type, priority, created_by)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (new_client_id, datetime.now().strftime('%Y-%m-%d'), new_note_text, 
-                          new_note_type, new_priority, new_created_by))
-                    
-                    conn.commit()
-                    conn.close()
-                    
+                    self.add_notes([(new_client_id, datetime.now().strftime('%Y-%m-%d'), new_note_text,
+                                     new_note_type, new_priority, new_created_by)])
                     st.success("Note added successfully!")
-                    st.rerun()
                 else:
                     st.error("Please fill in Client ID and Note Text.")
+        
+        with notes_list:
+            # Filters are applied by SQLite; only the ten newest matches come back
+            filtered_notes = self.load_notes(client_id, note_type_filter, priority_filter, tuple(date_range))
+            
+            # Display notes
+            if len(filtered_notes) > 0:
+                # One markdown element for the whole list rather than one per note
+                notes_html = "\n".join(
+                    NOTE_CARD_HTML.format(note=note, priority_class=PRIORITY_CLASSES.get(note.priority, ''))
+                    for note in filtered_notes.itertuples(index=False)
+                )
+                st.markdown(notes_html, unsafe_allow_html=True)
+            else:
+                st.info("No notes found for the selected criteria.")
+
+@st.cache_resource
+def _get_dashboard() -> AdvancedAnalyticsDashboard:
+    """Process-wide dashboard, so the schema setup in its constructor runs once rather than every rerun"""
+    return AdvancedAnalyticsDashboard()
 
 def main():
     """Main application function"""
-    dashboard = AdvancedAnalyticsDashboard()
+    dashboard = _get_dashboard()
     
     # Apply CSS
     dashboard.render_advanced_css()
     
-    # Load data
+    # Load data; sample notes are seeded once per process here rather than on the first notes view
     data = dashboard.load_data()
+    dashboard.seed_sample_notes()
     
     # Professional Header with Logo
     st.markdown("""
@@ -2042,19 +1847,22 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
-    # Create tabs
-    tab1, tab2, tab3, tab4 = st.tabs(["📊 Client Overview", "💰 Client Flows", "👤 Individual Analysis", "📝 Notes Management"])
+    # View selector; unlike st.tabs, only the selected view's pipeline runs on each rerun
+    view = st.radio(
+        "View",
+        ["📊 Client Overview", "💰 Client Flows", "👤 Individual Analysis", "📝 Notes Management"],
+        horizontal=True,
+        key="active_tab",
+        label_visibility="collapsed"
+    )
     
-    with tab1:
+    if view == "📊 Client Overview":
         dashboard.render_client_overview(data)
-    
-    with tab2:
+    elif view == "💰 Client Flows":
         dashboard.render_client_flows(data)
-    
-    with tab3:
+    elif view == "👤 Individual Analysis":
         dashboard.render_individual_client_analysis(data)
-    
-    with tab4:
+    else:
         dashboard.render_client_notes_section()
 
 if __name__ == "__main__":
@@ -0,0 +1,122 @@
+"""
+Grouped Aggregation Kernels for PMS Intelligence Hub
+Single-pass sum/mean/std/count over integer-encoded group keys
+Author: Vulnuris Development Team
+"""
+
+from typing import Dict, List, Tuple, Union
+import pandas as pd
+import numpy as np
+
+GroupKeys = Union[pd.Series, List[pd.Series]]
+
+def encode_groups(keys: GroupKeys, sort: bool = True) -> Tuple[np.ndarray, int, pd.Index]:
+    """Encode one or more key columns into dense group ids
+
+    Returns the per-row group id (-1 for rows with a missing key), the
+    number of observed groups and the index labelling each group id.
+    """
+    if isinstance(keys, pd.Series):
+        codes, uniques = pd.factorize(keys, sort=sort)
+        return codes, len(uniques), pd.Index(uniques, name=keys.name)
+
+    # Composite key: combine per-column codes, then keep only observed combinations
+    per_key = [pd.factorize(key, sort=sort) for key in keys]
+    shape = tuple(max(len(uniques), 1) for _, uniques in per_key)
+    valid = np.logical_and.reduce([codes >= 0 for codes, _ in per_key])
+    flat = np.full(len(valid), -1, dtype=np.int64)
+    flat[valid] = np.ravel_multi_index(tuple(codes[valid] for codes, _ in per_key), shape)
+
+    observed, dense = np.unique(flat[valid], return_inverse=True)
+    codes = np.full(len(valid), -1, dtype=np.int64)
+    codes[valid] = dense
+
+    positions = np.unravel_index(observed, shape)
+    index = pd.MultiIndex.from_arrays(
+        [pd.Index(uniques).take(position) for (_, uniques), position in zip(per_key, positions)],
+        names=[key.name for key in keys]
+    )
+    return codes, len(observed), index
+
+def group_aggregate(keys: GroupKeys, aggregations: Dict[str, Tuple[pd.Series, str]],
+                    sort: bool = True) -> pd.DataFrame:
+    """Grouped sum/mean/std/count of several columns sharing one key encoding
+
+    ``aggregations`` maps output column name to ``(values, how)`` where
+    ``how`` is one of ``'sum'``, ``'mean'``, ``'std'`` (ddof=1), ``'count'``
+    (non-null values) or ``'size'`` (rows per group; ``values`` is ignored
+    and may be None). Every statistic is a single bincount pass over the
+    group ids, so keys are hashed once rather than once per column, and a
+    column asked for both its mean and std is summed only once.
+    """
+    codes, n_groups, index = encode_groups(keys, sort=sort)
+    valid = codes >= 0
+    if not valid.all():
+        codes = codes[valid]
+
+    counts = np.bincount(codes, minlength=n_groups)
+    safe_counts = np.maximum(counts, 1)
+
+    result = {}
+    sums_by_column = {}
+    for name, (values, how) in aggregations.items():
+        if how == 'size':
+            result[name] = counts
+            continue
+        if how == 'count':
+            present = np.asarray(pd.notna(values))
+            if not valid.all():
+                present = present[valid]
+            result[name] = np.bincount(codes, weights=present, minlength=n_groups).astype(np.int64)
+            continue
+
+        if id(values) not in sums_by_column:
+            weights = np.asarray(values, dtype=np.float64)
+            if not valid.all():
+                weights = weights[valid]
+            sums_by_column[id(values)] = weights, np.bincount(codes, weights=weights, minlength=n_groups)
+        weights, sums = sums_by_column[id(values)]
+
+        if how == 'sum':
+            result[name] = sums
+        elif how == 'mean':
+            result[name] = np.where(counts > 0, sums / safe_counts, np.nan)
+        elif how == 'std':
+            sum_squares = np.bincount(codes, weights=weights * weights, minlength=n_groups)
+            variance = (sum_squares - sums * sums / safe_counts) / np.maximum(counts - 1, 1)
+            result[name] = np.where(counts > 1, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+        else:
+            raise ValueError(f"Unsupported aggregation: {how}")
+
+    return pd.DataFrame(result, index=index)
+
+def group_matrix(rows: pd.Series, columns: pd.Series, values: pd.Series,
+                 how: str = 'mean', fill_value: float = 0.0) -> pd.DataFrame:
+    """Dense rows x columns table of a grouped sum or mean
+
+    Equivalent to ``values.groupby([rows, columns]).agg(how).unstack(fill_value=...)``
+    but both keys are factorized once and the cells are filled by a single
+    bincount over the flattened (row, column) ids, with no intermediate
+    MultiIndex. Labels on both axes are sorted, as with ``unstack``.
+    """
+    if how not in ('sum', 'mean'):
+        raise ValueError(f"Unsupported aggregation: {how}")
+
+    row_codes, row_labels = pd.factorize(rows, sort=True)
+    column_codes, column_labels = pd.factorize(columns, sort=True)
+    shape = (len(row_labels), len(column_labels))
+
+    valid = (row_codes >= 0) & (column_codes >= 0)
+    cells = row_codes[valid] * shape[1] + column_codes[valid]
+    weights = np.asarray(values, dtype=np.float64)[valid]
+
+    counts = np.bincount(cells, minlength=shape[0] * shape[1])
+    sums = np.bincount(cells, weights=weights, minlength=shape[0] * shape[1])
+    cells_out = sums if how == 'sum' else sums / np.maximum(counts, 1)
+
+    matrix = np.where(counts > 0, cells_out, fill_value).reshape(shape)
+    return pd.DataFrame(
+        matrix,
+        index=pd.Index(row_labels, name=rows.name),
+        columns=pd.Index(column_labels, name=columns.name)
+    )
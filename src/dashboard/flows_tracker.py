@@ -109,7 +109,7 @@ class ClientFlowsTracker:
                 FROM client_flows cf
                 LEFT JOIN clients c ON cf.client_id = c.client_id
                 ORDER BY cf.transaction_date DESC
-            ''', conn)
+            ''', conn, parse_dates={'transaction_date': '%Y-%m-%d'})
         except:
             flows_df = pd.DataFrame()
         
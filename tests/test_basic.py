@@ -87,6 +87,131 @@ def test_data_integrity():
         print(f"❌ Data integrity test failed: {e}")
         return False
 
+def test_group_aggregate():
+    """Test grouped kernels against pandas groupby"""
+    try:
+        import numpy as np
+        from analytics_kernels import group_aggregate, group_matrix
+        
+        frame = pd.DataFrame({
+            'rm_name': ['A', 'B', 'A', 'C', 'B', 'A'],
+            'portfolio_type': ['Equity', 'Debt', 'Debt', 'Equity', 'Debt', 'Equity'],
+            'current_aum': [10.0, 20.0, 5.0, 7.5, 2.5, 1.0]
+        })
+        
+        aum = frame['current_aum']
+        result = group_aggregate(frame['rm_name'], {
+            'total_aum': (aum, 'sum'),
+            'avg_aum': (aum, 'mean'),
+            'risk': (aum, 'std'),
+            'client_count': (aum, 'count'),
+            'rows': (None, 'size')
+        })
+        expected = frame.groupby('rm_name')['current_aum'].agg(['sum', 'mean', 'std', 'count', 'size'])
+        assert np.allclose(result.to_numpy(), expected.to_numpy(), equal_nan=True), "Single-key aggregates differ"
+        
+        composite = group_aggregate([frame['rm_name'], frame['portfolio_type']], {
+            'total_aum': (frame['current_aum'], 'sum')
+        })
+        expected = frame.groupby(['rm_name', 'portfolio_type'])['current_aum'].sum()
+        assert composite['total_aum'].equals(expected.rename('total_aum')), "Composite-key sums differ"
+        
+        matrix = group_matrix(frame['rm_name'], frame['portfolio_type'], frame['current_aum'])
+        expected = frame.groupby(['rm_name', 'portfolio_type'])['current_aum'].mean().unstack(fill_value=0)
+        assert matrix.equals(expected.astype(float)), "Dense matrix means differ"
+        
+        print("✅ Group aggregate test passed")
+        return True
+    except Exception as e:
+        print(f"❌ Group aggregate test failed: {e}")
+        return False
+
+def test_bucket_counts():
+    """Test single-pass bucket counts against pd.cut"""
+    try:
+        from advanced_analytics_dashboard import BUCKET_SPECS, _bucket_counts, _generate_sample_clients
+        data = _generate_sample_clients()
+        
+        counts = _bucket_counts([data[column].to_numpy() for column, _, _ in BUCKET_SPECS],
+                                [edges for _, edges, _ in BUCKET_SPECS])
+        for (column, edges, labels), column_counts in zip(BUCKET_SPECS, counts):
+            expected = pd.cut(data[column], bins=edges, labels=labels, right=False).value_counts()
+            assert column_counts.tolist() == expected.reindex(labels).tolist(), f"{column} buckets differ"
+        
+        print("✅ Bucket counts test passed")
+        return True
+    except Exception as e:
+        print(f"❌ Bucket counts test failed: {e}")
+        return False
+
+def test_top_k_positions():
+    """Test partial top/bottom selection against nlargest/nsmallest, ties included"""
+    try:
+        import numpy as np
+        from advanced_analytics_dashboard import _top_k_positions
+        
+        rng = np.random.default_rng(3)
+        for _ in range(200):
+            values = pd.Series(rng.integers(0, 20, 60).astype(np.float32))
+            largest = _top_k_positions(values.to_numpy(), 15)
+            smallest = _top_k_positions(values.to_numpy(), 10, largest=False)
+            assert largest.tolist() == values.nlargest(15).index.tolist(), "Top positions differ from nlargest"
+            assert smallest.tolist() == values.nsmallest(10).index.tolist(), "Bottom positions differ from nsmallest"
+        
+        print("✅ Top-k positions test passed")
+        return True
+    except Exception as e:
+        print(f"❌ Top-k positions test failed: {e}")
+        return False
+
+def test_fused_return_stats():
+    """Test the one-pass return statistics against pandas"""
+    try:
+        import numpy as np
+        from advanced_analytics_dashboard import _fused_return_stats
+        
+        rng = np.random.default_rng(7)
+        returns = pd.Series(1e6 + rng.normal(12, 5, 500))
+        benchmark = pd.Series(1e6 + 0.6 * (returns - 1e6) + rng.normal(0, 2, 500))
+        
+        stats = _fused_return_stats(returns.to_numpy(), benchmark.to_numpy())
+        expected = (returns.mean(), benchmark.mean(), returns.std(), benchmark.std(),
+                    returns.corr(benchmark), (returns - benchmark).std())
+        assert np.allclose(stats, expected, rtol=1e-9), "Fused statistics differ from pandas"
+        
+        print("✅ Fused return stats test passed")
+        return True
+    except Exception as e:
+        print(f"❌ Fused return stats test failed: {e}")
+        return False
+
+def test_empty_demographic_view():
+    """Test that the demographic charts build when filters leave no clients"""
+    cwd = os.getcwd()
+    try:
+        import tempfile
+        from advanced_analytics_dashboard import (AdvancedAnalyticsDashboard, CLIENT_COLUMNS, CLIENT_DTYPES,
+                                                  _generate_sample_clients)
+        
+        # main_dashboard writes its own client_notes schema to the same file name, so use a fresh directory
+        with tempfile.TemporaryDirectory() as workdir:
+            os.chdir(workdir)
+            dashboard = AdvancedAnalyticsDashboard()
+            empty = _generate_sample_clients()[CLIENT_COLUMNS].astype(CLIENT_DTYPES).iloc[:0]
+            
+            metrics = dashboard.calculate_comprehensive_metrics(empty)
+            charts = dashboard.create_client_overview_charts(empty, metrics, "Demographic Analysis", 'default')
+            assert 'age_performance' in charts, "Age vs performance chart missing"
+            assert all(len(trace.x) == 0 for trace in charts['age_performance'].data), "Empty view drew points"
+        
+        print("✅ Empty demographic view test passed")
+        return True
+    except Exception as e:
+        print(f"❌ Empty demographic view test failed: {e}")
+        return False
+    finally:
+        os.chdir(cwd)
+
 if __name__ == "__main__":
     print("🧪 Running PMS Intelligence Hub Test Suite")
     print("=" * 50)
@@ -95,7 +220,12 @@ if __name__ == "__main__":
         ("Import Test", test_imports),
         ("Dashboard Functionality", test_dashboard_functionality),
         ("Flows Tracker", test_flows_tracker),
-        ("Data Integrity", test_data_integrity)
+        ("Data Integrity", test_data_integrity),
+        ("Group Aggregate", test_group_aggregate),
+        ("Bucket Counts", test_bucket_counts),
+        ("Top-K Positions", test_top_k_positions),
+        ("Fused Return Stats", test_fused_return_stats),
+        ("Empty Demographic View", test_empty_demographic_view)
     ]
     
     passed = 0